@@ -0,0 +1,112 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class SharedEncoder:
+    """
+    One SentenceTransformer instance shared by every module in the process.
+
+    Embeddings are returned as L2-normalized float32 arrays and memoized in an LRU
+    keyed by a hash of the text, so a question is only embedded once regardless of
+    which validator asks for it.
+    """
+
+    def __init__(self, model_name, max_cache_entries=20000):
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.max_cache_entries = max_cache_entries
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    @staticmethod
+    def text_key(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def encode(self, texts, use_cache=True, batch_size=64):
+        """
+        Encode texts into an (n, dim) array of normalized float32 embeddings.
+
+        Args:
+            texts (list): Texts to encode
+            use_cache (bool): Look up and store embeddings in the text-hash cache.
+                Bulk corpus encoding should pass False to avoid flushing the cache.
+            batch_size (int): Encoder batch size for the texts that must be computed
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        if not use_cache:
+            return self._encode_batch(texts, batch_size)
+
+        keys = [self.text_key(text) for text in texts]
+        embeddings = [None] * len(texts)
+        missing = OrderedDict()
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    embeddings[i] = self._cache[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, texts[i])
+                    self.misses += 1
+
+        if missing:
+            computed = dict(zip(missing.keys(), self._encode_batch(list(missing.values()), batch_size)))
+            with self._cache_lock:
+                for key, embedding in computed.items():
+                    self._cache[key] = embedding
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+            for i, key in enumerate(keys):
+                if embeddings[i] is None:
+                    embeddings[i] = computed[key]
+
+        return np.stack(embeddings)
+
+    def stats(self):
+        """Return embedding cache counters."""
+        with self._cache_lock:
+            return {
+                'model': self.model_name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._cache)
+            }
+
+    def _encode_batch(self, texts, batch_size):
+        with self._encode_lock:
+            embeddings = self.model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        return np.asarray(embeddings, dtype=np.float32)
+
+
+def get_encoder(model_name=DEFAULT_MODEL_NAME):
+    """Return the process-wide shared encoder for a model name, loading it on first use."""
+    with _registry_lock:
+        encoder = _registry.get(model_name)
+        if encoder is None:
+            encoder = SharedEncoder(model_name)
+            _registry[model_name] = encoder
+        return encoder
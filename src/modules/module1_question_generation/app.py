@@ -4,6 +4,7 @@ import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import datetime
+import time
 import pandas as pd
 
 # Adjust the system path to find project modules
@@ -15,10 +16,15 @@ from src.modules.module2_relevancy.relevance_analyzer import EnhancedRelevanceAn
 from groq_client import GroqClient
 from file_processing import extract_text_from_file
 from src.modules.module3_compare.model import QuestionSimilarityModel
-from src.modules.module4_bias.bias import screen_questions
 from src.modules.module1_question_generation.project_controller import Project
+from src.modules.module1_question_generation.pipeline import TYPE_VALIDATORS, run_analysis
+from src.modules.module1_question_generation.question_bank import get_question_bank
+from src.modules.module1_question_generation.jobs import FAILED, IN_FLIGHT, JobQueue
+from src.modules.orchestrator import ValidationOrchestrator
 from src.modules.module1_question_generation.tool_controller import *
 DATASET_DIR = "dataset"
+# Seconds between progress polls of a running analysis job
+JOB_POLL_INTERVAL = 1.0
 project_control = Project()
 if 'page' not in st.session_state:
     st.session_state.page = 'main'
@@ -68,10 +74,47 @@ def sidebar():
     if ('current_project' in st.session_state and  st.sidebar.button('Configure Project')):
         st.session_state.page = 'configure'
 
-def main_page():
-    client = GroqClient()
+@st.cache_resource
+def load_validators():
+    # Built once per process; both share the encoder from the model registry
     analyzer = EnhancedRelevanceAnalyzer()
     similarity_model = QuestionSimilarityModel('dataset/leetcode_dataset.csv')
+    return analyzer, similarity_model
+
+@st.cache_resource
+def load_job_queue():
+    # One queue per process; its workers run analyses off the Streamlit script thread
+    analyzer, similarity_model = load_validators()
+    client = GroqClient()
+    bank = get_question_bank()
+    orchestrator = ValidationOrchestrator(analyzer, similarity_model)
+
+    def analysis(params, job):
+        result = run_analysis(
+            params["job_role"], params["jd_text"], params["question_type"], client, analyzer, similarity_model,
+            bank=bank, stream=params["stream"], report=job.report
+        )
+        if params["all_validators"] and result["questions"]:
+            job.report("all_validators", 0.9)
+            # The type's own validator already scored every question
+            validator = TYPE_VALIDATORS.get(params["question_type"])
+            precomputed = {validator: result["scores"]} if validator else None
+            result["report"] = orchestrator.run(result["questions"], params["jd_text"], precomputed=precomputed)
+        return result
+
+    return JobQueue(handlers={"analysis": analysis}).start()
+
+def describe_score(question_type, score):
+    if question_type == "DSA":
+        best_match = score['best_match']['title'] if score['best_match'] else "none"
+        return f"similarity {score['relevance_score']:.2f}, best match: {best_match}"
+    if question_type == "Behaviour":
+        return "Invalid" if score == 1 else "Valid"
+    return f"relevance {score:.2f}"
+
+def main_page():
+    analyzer, similarity_model = load_validators()
+    job_queue = load_job_queue()
     project = st.session_state["current_project"]
     
     st.subheader('Project: ', project['project_name'])
@@ -79,114 +122,164 @@ def main_page():
     job_role = st.text_input("Enter Job Role")
     question_type = st.selectbox("Type of questions", ["DSA", "Technical", "Behaviour"])
     jd_file = st.file_uploader("Upload Job Description (PDF/DOCX)", type=["pdf", "docx"])
+    stream_mode = st.checkbox("Stream questions and scores as they are generated")
+    all_validators = st.checkbox("Also run relevance, DSA and bias checks on every question")
     
 
     if jd_file and job_role and question_type and st.button('Get questions') :
-        with st.spinner("Analyzing Job Description..."):
-            jd_text = extract_text_from_file(jd_file)
-
-            if not analyzer.check_title_jd_match(job_role, jd_text):
-                st.error("⚠️ Job description doesn't match the job title! Upload a relevant JD.")
-                st.stop()
-
-            questions = client.generate_questions(job_role, jd_text, question_type)
-
-            # Deterministic
-            d_results = verify_deterministic_assertions(questions, project["assertions"])
-            df_results = pd.DataFrame(list(d_results.items()), columns=["Assertion Type", "Result"])
-            st.table(df_results)
-            question_lines = [q.strip() for q in questions.split('\n') if q.strip()]
-            if question_lines and not question_lines[0][0].isdigit():
-                question_lines = question_lines[1:]
-
-            # first_five_questions = question_lines[:10]
-            # remaining_questions = question_lines[5:15]
-            scores = []
-
-            if (question_type == "DSA"): 
-                similarity_results = similarity_model.check_similarity(question_lines)
-                scores = similarity_results
-                st.subheader("DSA questions with similarity analysis")
-                score = 0
-                for i, (question, result) in enumerate(zip(question_lines, similarity_results), 1):
-                    st.write(f"{i}. {question}")
-                    score += result["relevance_score"]
-                    with st.expander(f"Similarity Analysis for Question {i}"):
-                        st.write(f"Similarity Score: {result['relevance_score']:.2f}")
-                        st.write(f"Best Match: {result['best_match']['title']}")
-                        st.write(f"Difficulty: {result['best_match']['difficulty']}")
-                        if result['matched_sources']:
-                            st.write("\nSimilar Questions:")
-                            for source in result['matched_sources']:
-                                st.write(f"- {source['title']} (Difficulty: {source['difficulty']})")
-                overall_similarity = score / len(question_lines)
-
-                st.metric("Overall Relevance", f"{overall_similarity*100:.1f}%")
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                project['accuracy_history'][question_type].append((timestamp, overall_similarity))
-
-            # if (question_type == "Technical" or question_type == "Behaviour"):
-                
-                
-
-            if (question_type == "Technical"):
-                for q in question_lines:
-                    st.write(f"- {q}")
-                scores = analyzer.calculate_question_scores(jd_text, question_lines)
-                avg_score = sum(scores) / len(scores)
-
-                half_avg = avg_score / 1.25
-                count_above_half = sum(1 for s in scores if s > half_avg)
-                overall_relevance = (count_above_half / len(scores)) * 100
-
-                st.subheader("Analysis Results")
-                st.metric("Overall Relevance", f"{overall_relevance:.1f}%")
-
-                # Store accuracy with timestamp
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                project['accuracy_history'][question_type].append((timestamp, overall_relevance))
-
-            if question_type == "Behaviour": 
-                valid_bias_questions, invalid_bias_questions, bias_accuracy, validity = screen_questions(question_lines)
-                for i, q in enumerate(question_lines):
-                    st.write(f"- {f'[Invalid {validity[i]:.2f}]' if validity[i] == 1 else f'[ Valid {validity[i]:.2f}]'} {q}")
-
-                st.metric("Bias Accuracy", f"{bias_accuracy * 100:.1f}%")
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                project['accuracy_history'][question_type].append((timestamp, bias_accuracy))
-
-            # Plot accuracy history
-            if project['accuracy_history']:
-                st.subheader("Accuracy History")
-                timestamps, accuracies = zip(*project['accuracy_history'][question_type])
-                fig, ax = plt.subplots()
-                ax.plot(timestamps, accuracies, marker='o')
-                ax.set_xlabel("Timestamp")
-                ax.set_ylabel("Overall Relevance (%)")
-                ax.set_title("Relevance Over Time")
-                plt.xticks(rotation=45)
-                st.pyplot(fig)
-
-            export_data = []
-            for i, (question, score) in enumerate(zip(question_lines, scores), 1):
-                export_data.append(f"Q{i}. {question}")
-                if (question_type == "DSA"):
-                    export_data.append(f"Overall Score: {score['relevance_score']}")
-                    export_data.append(f"Best Match: {score['best_match']['title']}")
-                else:
-                    export_data.append(f"Overall Score: {score}")
-                export_data.append("")
-
-            # for i, (question, score) in enumerate(zip(remaining_questions, scores[5:15]), 5):
-            #     export_data.append(f"Q{i}. {question}")
-            #     export_data.append("")
-            project_control.save_project(project["project_name"], project)
-            st.download_button(
-                "Download Questions with Analysis",
-                f"Job Role: {job_role}\n\n\n" + "\n".join(export_data),
-                file_name=f"{job_role.replace(' ', '_')}_questions_analysis.txt",
-                mime="text/plain"
-            )
+        jd_text = extract_text_from_file(jd_file)
+        # Identical requests still in flight share one job
+        st.session_state['job_id'] = job_queue.submit("analysis", {
+            "job_role": job_role,
+            "jd_text": jd_text,
+            "question_type": question_type,
+            "stream": stream_mode,
+            "all_validators": all_validators
+        })
+
+    job = job_queue.get(st.session_state['job_id']) if 'job_id' in st.session_state else None
+    if job is None:
+        return
+    if job.status in IN_FLIGHT:
+        st.progress(job.progress, text=f"Analyzing Job Description... ({job.stage or 'queued'})")
+        partial = job.partial or {}
+        scores = partial.get('scores', [])
+        for i, question in enumerate(partial.get('questions', []), 1):
+            if i <= len(scores):
+                st.write(f"{i}. {question} ({describe_score(job.params['question_type'], scores[i - 1])})")
+            else:
+                st.write(f"{i}. {question}")
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+    if job.status == FAILED:
+        st.error(f"Analysis failed: {job.error}")
+        return
+    show_results(project, job, similarity_model)
+
+def show_results(project, job, similarity_model):
+    job_role = job.params['job_role']
+    question_type = job.params['question_type']
+    analysis = job.result
+    if not analysis['title_match']:
+        st.error("⚠️ Job description doesn't match the job title! Upload a relevant JD.")
+        return
+    question_lines, scores = analysis['questions'], analysis['scores']
+    if analysis['reused']:
+        st.info(f"Reused {analysis['reused']} validated questions from the question bank")
+    # Reruns redraw a finished job; its accuracy is only recorded once
+    record = st.session_state.get('recorded_job') != job.id
+
+    # Deterministic assertions check the raw LLM completion, as they did before the question bank
+    if analysis.get('completion'):
+        d_results = verify_deterministic_assertions(analysis['completion'], project["assertions"])
+        df_results = pd.DataFrame(list(d_results.items()), columns=["Assertion Type", "Result"])
+        st.table(df_results)
+        if analysis['reused']:
+            st.caption("Assertions checked the newly generated questions only")
+    else:
+        st.caption("All questions came from the question bank; there is no new completion to check assertions on")
+
+    if not question_lines:
+        st.warning("No questions could be parsed from the LLM response. Try generating again.")
+        return
+
+    if (question_type == "DSA"): 
+        similarity_results = scores
+        st.subheader("DSA questions with similarity analysis")
+        score = 0
+        for i, (question, result) in enumerate(zip(question_lines, similarity_results), 1):
+            st.write(f"{i}. {question}")
+            score += result["relevance_score"]
+            with st.expander(f"Similarity Analysis for Question {i}"):
+                st.write(f"Similarity Score: {result['relevance_score']:.2f}")
+                if result['best_match']:
+                    st.write(f"Best Match: {result['best_match']['title']}")
+                    st.write(f"Difficulty: {result['best_match']['difficulty']}")
+                if result['matched_sources']:
+                    st.write("\nSimilar Questions:")
+                    for source in result['matched_sources']:
+                        st.write(f"- {source['title']} (Difficulty: {source['difficulty']})")
+        overall_similarity = score / len(question_lines)
+
+        st.metric("Overall Relevance", f"{overall_similarity*100:.1f}%")
+        coverage = similarity_model.concept_coverage(question_lines)
+        st.metric("DSA Concept Coverage", f"{coverage['coverage']*100:.1f}%")
+        if coverage['covered']:
+            st.write("Covered concepts: " + ", ".join(coverage['covered']))
+        if record:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            project['accuracy_history'][question_type].append((timestamp, overall_similarity))
+
+    if (question_type == "Technical"):
+        for q in question_lines:
+            st.write(f"- {q}")
+        avg_score = sum(scores) / len(scores)
+
+        half_avg = avg_score / 1.25
+        count_above_half = sum(1 for s in scores if s > half_avg)
+        overall_relevance = (count_above_half / len(scores)) * 100
+
+        st.subheader("Analysis Results")
+        st.metric("Overall Relevance", f"{overall_relevance:.1f}%")
+
+        # Store accuracy with timestamp
+        if record:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            project['accuracy_history'][question_type].append((timestamp, overall_relevance))
+
+    if question_type == "Behaviour": 
+        validity = scores
+        bias_accuracy = validity.count(0) / len(validity) if validity else 0
+        for i, q in enumerate(question_lines):
+            st.write(f"- {f'[Invalid {validity[i]:.2f}]' if validity[i] == 1 else f'[ Valid {validity[i]:.2f}]'} {q}")
+
+        st.metric("Bias Accuracy", f"{bias_accuracy * 100:.1f}%")
+        if record:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            project['accuracy_history'][question_type].append((timestamp, bias_accuracy))
+
+    # Plot accuracy history
+    if project['accuracy_history']:
+        st.subheader("Accuracy History")
+        timestamps, accuracies = zip(*project['accuracy_history'][question_type])
+        fig, ax = plt.subplots()
+        ax.plot(timestamps, accuracies, marker='o')
+        ax.set_xlabel("Timestamp")
+        ax.set_ylabel("Overall Relevance (%)")
+        ax.set_title("Relevance Over Time")
+        plt.xticks(rotation=45)
+        st.pyplot(fig)
+
+    export_data = []
+    for i, (question, score) in enumerate(zip(question_lines, scores), 1):
+        export_data.append(f"Q{i}. {question}")
+        if (question_type == "DSA"):
+            export_data.append(f"Overall Score: {score['relevance_score']}")
+            if score['best_match']:
+                export_data.append(f"Best Match: {score['best_match']['title']}")
+        else:
+            export_data.append(f"Overall Score: {score}")
+        export_data.append("")
+
+    if analysis.get('report'):
+        report = analysis['report']
+        st.subheader("All validators")
+        st.table(pd.DataFrame(report['per_question']))
+        for name, value in report['summary'].items():
+            st.metric(name.replace('_', ' ').title(), f"{value:.2f}")
+        st.caption("Stage timings: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in report['timings'].items()))
+        for name, error in report['errors'].items():
+            st.warning(f"{name} validator failed: {error}")
+
+    if record:
+        project_control.save_project(project["project_name"], project)
+        st.session_state['recorded_job'] = job.id
+    st.download_button(
+        "Download Questions with Analysis",
+        f"Job Role: {job_role}\n\n\n" + "\n".join(export_data),
+        file_name=f"{job_role.replace(' ', '_')}_questions_analysis.txt",
+        mime="text/plain"
+    )
 
 def configure_page():
     st.title("Project Configuration")
@@ -0,0 +1,294 @@
+import os
+import csv
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+QUESTION_TYPES = ("DSA", "Technical", "Behaviour")
+DEFAULT_DSA_DATASET = "dataset/leetcode_dataset.csv"
+# Plain-text JDs are read as-is; PDF/DOCX go through the extraction service
+TEXT_EXTENSIONS = (".txt", ".md")
+# Rough token cost of a generation prompt without the JD text
+PROMPT_TOKENS = 150
+
+# Per-process state built by _init_worker
+_worker = {}
+
+
+def read_manifest(path):
+    """
+    Yield one task dict per (requisition, question type) in a CSV or JSONL manifest.
+
+    Each row needs `role` and `jd_file` (relative to the manifest) and may give
+    `id` and `question_types` (a list in JSONL; comma or semicolon separated in
+    CSV; all types when omitted). Task ids are "<id>:<question type>".
+    """
+    extension = os.path.splitext(path)[1].lower()
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if extension in (".jsonl", ".json"):
+            rows = (json.loads(line) for line in f if line.strip())
+        elif extension == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            raise ValueError(f"Unsupported manifest type '{extension}'. Use .jsonl or .csv")
+
+        for number, row in enumerate(rows, 1):
+            types = row.get("question_types") or QUESTION_TYPES
+            if isinstance(types, str):
+                types = [t.strip() for t in types.replace(";", ",").split(",") if t.strip()]
+            unknown = set(types) - set(QUESTION_TYPES)
+            if unknown:
+                raise ValueError(f"Manifest row {number}: unknown question types {sorted(unknown)}")
+            row_id = str(row.get("id") or number)
+            for question_type in types:
+                yield {
+                    "id": f"{row_id}:{question_type}",
+                    "role": row["role"],
+                    "jd_file": os.path.join(base_dir, row["jd_file"]),
+                    "question_type": question_type
+                }
+
+
+def completed_ids(output_path):
+    """
+    Ids of tasks already written successfully to the output JSONL.
+
+    A line cut off by a crash is truncated away so appending resumes cleanly.
+    """
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+    done = set()
+    for line in data[:end].decode("utf-8").splitlines():
+        record = json.loads(line)
+        if record.get("error") is None:
+            done.add(record["id"])
+    return done
+
+
+def estimate_task_tokens(task):
+    """
+    Rough token cost of a task's generation request. Only Technical prompts
+    include the JD; PDF/DOCX JDs are not counted since their text length is
+    unknown before extraction.
+    """
+    from src.modules.module1_question_generation.llm_transport import DEFAULT_COMPLETION_TOKENS
+
+    jd_tokens = 0
+    if task["question_type"] == "Technical" and os.path.splitext(task["jd_file"])[1].lower() in TEXT_EXTENSIONS \
+            and os.path.exists(task["jd_file"]):
+        jd_tokens = os.path.getsize(task["jd_file"]) // 4
+    return PROMPT_TOKENS + jd_tokens + DEFAULT_COMPLETION_TOKENS
+
+
+def _init_worker(config):
+    from src.modules.module1_question_generation.groq_client import GroqClient
+    from src.modules.module1_question_generation.llm_cache import LLMResponseCache
+    from src.modules.module1_question_generation.llm_transport import LLMTransport
+    from src.modules.module2_relevancy.relevance_analyzer import EnhancedRelevanceAnalyzer
+
+    transport = LLMTransport(
+        base_url=config["base_url"],
+        requests_per_minute=config["requests_per_minute"],
+        tokens_per_minute=config["tokens_per_minute"]
+    )
+    _worker["config"] = config
+    cache = LLMResponseCache(config["llm_cache_path"]) if config["llm_cache_path"] else None
+    _worker["client"] = GroqClient(cache=cache, transport=transport)
+    _worker["analyzer"] = EnhancedRelevanceAnalyzer()
+    _worker["similarity_model"] = None
+
+
+def _similarity_model():
+    # Only workers that meet a DSA task pay for loading the corpus index
+    if _worker["similarity_model"] is None:
+        from src.modules.module3_compare.model import QuestionSimilarityModel
+        _worker["similarity_model"] = QuestionSimilarityModel(_worker["config"]["dsa_dataset"])
+    return _worker["similarity_model"]
+
+
+def _read_jd(path):
+    if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    from src.modules.module1_question_generation.file_processing import extract_text_from_path
+    return extract_text_from_path(path)
+
+
+def _run_task(task):
+    """Generate and validate one task; returns its output record as a JSON line."""
+    from src.modules.module1_question_generation.pipeline import run_analysis
+    from src.modules.module1_question_generation.utils.helpers import json_default
+
+    start = time.perf_counter()
+    record = dict(task)
+    try:
+        jd_text = _read_jd(task["jd_file"])
+        similarity_model = _similarity_model() if task["question_type"] == "DSA" else None
+        record.update(run_analysis(
+            task["role"], jd_text, task["question_type"], _worker["client"], _worker["analyzer"], similarity_model
+        ))
+        record["error"] = None
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = time.perf_counter() - start
+    return json.dumps(record, default=json_default)
+
+
+def check_parquet_engine():
+    """Fail before a run starts when pandas has no Parquet engine to write the results with."""
+    import importlib.util
+
+    if not any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")):
+        raise RuntimeError("Parquet output needs pyarrow or fastparquet; install pyarrow (see requirements.txt)")
+
+
+def write_parquet(jsonl_path, parquet_path):
+    """Convert the JSONL results to Parquet, keeping the last record per task id."""
+    import pandas as pd
+
+    frame = pd.read_json(jsonl_path, lines=True)
+    frame = frame.drop_duplicates("id", keep="last")
+    # Score payloads differ per question type, so they are stored as JSON text;
+    # failed tasks have none, and a run where every task failed has no column at all
+    if "scores" in frame.columns:
+        frame["scores"] = frame["scores"].map(lambda scores: json.dumps(scores) if isinstance(scores, list) else None)
+    frame.to_parquet(parquet_path, index=False)
+
+
+def run_batch(manifest_path, output_path, workers=None, parquet_path=None, base_url=None,
+              dsa_dataset=DEFAULT_DSA_DATASET, requests_per_minute=None, tokens_per_minute=None,
+              llm_cache_path=None):
+    """
+    Run generate-and-validate for every task in a manifest on a process pool.
+
+    Results are appended to `output_path` as they complete, one JSON line per
+    task; rerunning skips tasks that already succeeded there. The provider
+    rate limits are split evenly across the worker processes, and the number
+    of workers is capped so each share still covers the largest request.
+    `llm_cache_path` overrides the shared LLM response cache.
+
+    Returns:
+        dict: Task/question counts, elapsed seconds and throughput of this run
+    """
+    from src.modules.module1_question_generation import llm_transport
+    from src.modules.module1_question_generation.file_processing import POOL_START_METHOD
+
+    if parquet_path:
+        check_parquet_engine()
+    workers = workers or os.cpu_count() or 1
+    requests_per_minute = requests_per_minute or llm_transport.REQUESTS_PER_MINUTE
+    tokens_per_minute = tokens_per_minute or llm_transport.TOKENS_PER_MINUTE
+
+    done = completed_ids(output_path)
+    tasks = [task for task in read_manifest(manifest_path) if task["id"] not in done]
+    largest = max((estimate_task_tokens(task) for task in tasks), default=0)
+    if largest and tokens_per_minute // workers < largest:
+        capped = max(1, tokens_per_minute // largest)
+        print(f"Using {capped} of {workers} workers: {tokens_per_minute} tokens/min cannot cover "
+              f"{workers} concurrent requests of ~{largest} tokens")
+        workers = capped
+    config = {
+        "base_url": base_url,
+        "dsa_dataset": dsa_dataset,
+        "llm_cache_path": llm_cache_path,
+        "requests_per_minute": max(1, requests_per_minute // workers),
+        "tokens_per_minute": max(1, tokens_per_minute // workers)
+    }
+
+    summary = {"skipped": len(done), "succeeded": 0, "failed": 0, "questions": 0}
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,),
+                                mp_context=multiprocessing.get_context(POOL_START_METHOD)) as executor:
+        pending = set()
+        remaining = iter(tasks)
+
+        def fill():
+            # Keep every worker busy without queueing the whole manifest at once
+            for task in remaining:
+                pending.add(executor.submit(_run_task, task))
+                if len(pending) >= workers * 2:
+                    return
+
+        fill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pending.remove(future)
+                line = future.result()
+                out.write(line + "\n")
+                out.flush()
+                record = json.loads(line)
+                if record["error"] is None:
+                    summary["succeeded"] += 1
+                    summary["questions"] += len(record["questions"])
+                else:
+                    summary["failed"] += 1
+                    print(f"Task {record['id']} failed: {record['error']}")
+            fill()
+
+    elapsed = time.perf_counter() - start
+    if parquet_path:
+        write_parquet(output_path, parquet_path)
+    processed = summary["succeeded"] + summary["failed"]
+    summary.update({
+        "seconds": elapsed,
+        "tasks_per_second": processed / elapsed if elapsed else 0.0,
+        "questions_per_second": summary["questions"] / elapsed if elapsed else 0.0
+    })
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch question generation and validation over a JD manifest")
+    parser.add_argument("manifest", help="Manifest (.csv or .jsonl) with role, jd_file and optional id, question_types")
+    parser.add_argument("output", help="JSONL file receiving one result per task; reused to resume")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--parquet", default=None, help="Also write the results to this Parquet file")
+    parser.add_argument("--dsa-dataset", default=DEFAULT_DSA_DATASET, help="Question corpus for DSA similarity")
+    parser.add_argument("--requests-per-minute", type=int, default=None, help="Provider request limit (all workers)")
+    parser.add_argument("--tokens-per-minute", type=int, default=None, help="Provider token limit (all workers)")
+    parser.add_argument("--stub-llm", action="store_true", help="Answer LLM calls from a local stub server")
+    args = parser.parse_args()
+
+    base_url = None
+    server = None
+    llm_cache_path = None
+    requests_per_minute, tokens_per_minute = args.requests_per_minute, args.tokens_per_minute
+    if args.stub_llm:
+        from src.modules.module1_question_generation.stub_server import start_stub_server
+        server, base_url = start_stub_server()
+        os.environ.setdefault("GROQ_API_KEY", "stub")
+        # Stub completions must not land in the shared response cache
+        llm_cache_path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite")
+        # The stub has no provider limits
+        requests_per_minute = requests_per_minute or 10 ** 6
+        tokens_per_minute = tokens_per_minute or 10 ** 9
+
+    try:
+        summary = run_batch(
+            args.manifest, args.output,
+            workers=args.workers,
+            parquet_path=args.parquet,
+            base_url=base_url,
+            dsa_dataset=args.dsa_dataset,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            llm_cache_path=llm_cache_path
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+    print(f"{summary['succeeded']} tasks succeeded, {summary['failed']} failed, {summary['skipped']} already done; "
+          f"{summary['questions']} questions in {summary['seconds']:.1f}s "
+          f"({summary['tasks_per_second']:.2f} tasks/s, {summary['questions_per_second']:.1f} questions/s)")
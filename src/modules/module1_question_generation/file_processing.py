@@ -1,16 +1,215 @@
+import io
+import os
+import json
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import PyPDF2
 from docx import Document
 
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# Uploads larger than this are rejected before parsing
+MAX_FILE_BYTES = 25 * 1024 * 1024
+# Pages beyond this are not extracted
+MAX_PAGES = 200
+# PDFs with fewer pages are extracted in-process; pool start-up would dominate
+PARALLEL_PAGE_THRESHOLD = 16
+# Pages handed to a worker per task
+PAGES_PER_TASK = 8
+# Optional directory for the on-disk tier of the extraction cache
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR")
+# Workers are never forked from the caller: the Streamlit server runs job workers,
+# torch and thread pools, and forking a threaded process can deadlock the child
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# PDF opened once per worker process by _init_worker
+_worker_reader = None
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def detect_file_type(name_or_mime):
+    """Map a MIME type or file name to 'pdf', 'docx' or None."""
+    value = (name_or_mime or "").lower()
+    if value == PDF_MIME or value.endswith(".pdf"):
+        return "pdf"
+    if value == DOCX_MIME or value.endswith(".docx"):
+        return "docx"
+    return None
+
+
+def _init_worker(data):
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(start, stop):
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(data, max_pages=MAX_PAGES, workers=None):
+    """
+    Yield the text of each PDF page in order.
+
+    Large documents are split into page ranges extracted on a process pool; each
+    worker parses the PDF once and pages are yielded as soon as their range and
+    all earlier ones are done.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = min(len(reader.pages), max_pages)
+    if page_count < PARALLEL_PAGE_THRESHOLD:
+        for i in range(page_count):
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,),
+                             mp_context=multiprocessing.get_context(POOL_START_METHOD)) as executor:
+        futures = [
+            executor.submit(_extract_page_range, start, min(start + PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PAGES_PER_TASK)
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def iter_docx_paragraphs(data):
+    for para in Document(io.BytesIO(data)).paragraphs:
+        yield para.text
+
+
+class TextExtractionService:
+    """
+    Text extraction keyed by the SHA-256 of the file bytes.
+
+    Extracted pages (paragraphs for DOCX) are kept in an in-memory LRU and, when
+    `cache_dir` is set, as JSON files on disk, so re-uploading or rerunning with
+    the same file never parses it twice. Inputs above `max_bytes` are rejected
+    and PDFs are cut off after `max_pages`.
+    """
+
+    def __init__(self, cache_dir=EXTRACTION_CACHE_DIR, max_entries=32, max_bytes=MAX_FILE_BYTES,
+                 max_pages=MAX_PAGES, workers=None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.workers = workers
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def iter_pages(self, data, file_type):
+        """
+        Yield page texts for the file bytes, from the cache when possible.
+
+        A fresh extraction is cached once the generator has been fully consumed.
+        """
+        if file_type not in ("pdf", "docx"):
+            return
+        if len(data) > self.max_bytes:
+            raise ValueError(f"File is {len(data)} bytes; the limit is {self.max_bytes} bytes")
+
+        key = f"{hash_bytes(data)}_{file_type}_{self.max_pages}"
+        pages = self._get(key)
+        if pages is not None:
+            yield from pages
+            return
+
+        pages = []
+        if file_type == "pdf":
+            source = iter_pdf_pages(data, self.max_pages, self.workers)
+        else:
+            source = iter_docx_paragraphs(data)
+        for page in source:
+            pages.append(page)
+            yield page
+        self._put(key, pages)
+
+    def extract(self, data, file_type):
+        return "\n".join(self.iter_pages(data, file_type))
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'memory_entries': len(self._memory)}
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                pages = json.load(f)
+            self._remember(key, pages)
+            with self._lock:
+                self.hits += 1
+            return pages
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put(self, key, pages):
+        self._remember(key, pages)
+        path = self._disk_path(key)
+        if path:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key, pages):
+        with self._lock:
+            self._memory[key] = pages
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_extraction_service():
+    """Process-wide extraction service (disk tier at EXTRACTION_CACHE_DIR if set)."""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = TextExtractionService()
+        return _shared_service
+
+
+def _read_upload(uploaded_file):
+    return uploaded_file.getvalue() if hasattr(uploaded_file, "getvalue") else uploaded_file.read()
+
+
+def iter_text_from_file(uploaded_file):
+    """Yield the text of an uploaded PDF/DOCX page by page as it is extracted."""
+    file_type = detect_file_type(uploaded_file.type)
+    return get_extraction_service().iter_pages(_read_upload(uploaded_file), file_type)
+
+
 def extract_text_from_file(uploaded_file):
     """Handle PDF and DOCX file parsing"""
-    text = ""
-    
-    if uploaded_file.type == "application/pdf":
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-        
-    elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        doc = Document(uploaded_file)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        
-    return text
\ No newline at end of file
+    return "\n".join(iter_text_from_file(uploaded_file))
+
+
+def extract_text_from_path(path):
+    """Extract text from a PDF/DOCX file on disk through the same cache."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return get_extraction_service().extract(data, detect_file_type(path))
@@ -1,41 +1,197 @@
-from groq import Groq
-import os
+import re
+import asyncio
+from collections import namedtuple
 from dotenv import load_dotenv
 
+from src.modules.module1_question_generation.llm_cache import get_llm_cache
+from src.modules.module1_question_generation.llm_transport import get_transport
+
 load_dotenv()
 
-class GroqClient:
-    def __init__(self):
-        api_key = os.getenv("GROQ_API_KEY")  
-        if not api_key:
-            raise ValueError("API key not found. Please set GROQ_API_KEY in the .env file.")
+MODEL_NAME = "llama3-70b-8192"
+# Questions requested per prompt unless a count is given
+DEFAULT_QUESTION_COUNT = 10
+
+# Numbered question line as requested by the prompt format ("Q3. ..."), also when the
+# model wraps it in markdown or a bullet ("**Q3.**", "- Q3:") or numbers it plainly ("3.")
+_QUESTION_PREFIX = r"^\s*(?:[-*+\u2022]\s+)?(?:[*_#]+\s*)?"
+QUESTION_LINE = re.compile(_QUESTION_PREFIX + r"(?:Q\s*\d+\b|\d+\s*[.):])")
+QUESTION_NUMBER = re.compile(_QUESTION_PREFIX + r"(?:Q\s*\d+|\d+)\s*(?:[*_]+\s*)?[.:)-]?\s*(?:[*_]+\s*)?")
+# Lines such as "Here are 10 questions:" or "## DSA" that introduce the questions
+HEADER_LINE = re.compile(r"^\s*(?:#.*|.*:\s*)$")
+
+# One (role, JD, question type) prompt for batch generation
+GenerationRequest = namedtuple('GenerationRequest', ['job_role', 'job_description', 'type'])
+
+# Outcome of one request: content on success, error otherwise
+GenerationResult = namedtuple('GenerationResult', ['request', 'content', 'error'])
+
+
+def parse_question_lines(content):
+    """
+    Split a completion into its numbered question lines.
 
-        self.client = Groq(api_key=api_key)
+    When no line is numbered, every non-empty line that is not a header is
+    taken as a question instead.
+    """
+    lines = [line.strip() for line in content.split("\n") if line.strip()]
+    questions = [line for line in lines if QUESTION_LINE.match(line)]
+    if questions:
+        return questions
+    return [line for line in lines if not HEADER_LINE.match(line)]
 
-    def generate_questions(self, job_role, job_description, type):
-        prompt = self._build_prompt(job_role, job_description, type)
+
+def strip_question_number(question):
+    """Drop the leading "Q<n>." label from a question line."""
+    return QUESTION_NUMBER.sub("", question, count=1).strip()
+
+
+class GroqClient:
+    def __init__(self, base_url=None, cache=None, transport=None):
+        """
+        Args:
+            base_url (str): Completions endpoint override, e.g. a local stub server.
+                Defaults to GROQ_BASE_URL or the public Groq API.
+            cache (LLMResponseCache): Response cache; defaults to the shared on-disk cache
+            transport (LLMTransport): Rate-limited, retrying transport; defaults to the
+                shared one for base_url
+        """
+        self.transport = transport if transport is not None else get_transport(base_url)
+        self.cache = cache if cache is not None else get_llm_cache()
+
+    def generate_questions(self, job_role, job_description, type, use_cache=True, count=DEFAULT_QUESTION_COUNT):
+        """
+        Generate questions for a role. Identical prompts are served from the
+        response cache; use_cache=False forces a fresh completion (which is then cached).
+        """
+        params = self._completion_params(job_role, job_description, type, count)
+        key = self.cache.fingerprint(**params)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
        
-        response = self.client.chat.completions.create(
-            model="llama3-70b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7
-        )
-        print(response.choices)
-        return response.choices[0].message.content
-
-    def _build_prompt(self, job_role, job_description, type):
+        content = self.transport.complete(**params)
+        self.cache.put(key, content)
+        return content
+
+    def cached_completion(self, job_role, job_description, type, count=DEFAULT_QUESTION_COUNT):
+        """The cached completion for a prompt, e.g. after stream_questions was consumed, or None."""
+        params = self._completion_params(job_role, job_description, type, count)
+        return self.cache.get(self.cache.fingerprint(**params))
+
+    def stream_questions(self, job_role, job_description, type, use_cache=True, count=DEFAULT_QUESTION_COUNT):
+        """
+        Stream the completion and yield each numbered question line as soon as it is complete.
+
+        The full completion is cached once the stream is consumed; a cached
+        response is replayed line by line. A completion without numbered lines
+        is yielded at the end, split by parse_question_lines.
+        """
+        params = self._completion_params(job_role, job_description, type, count)
+        key = self.cache.fingerprint(**params)
+        cached = self.cache.get(key) if use_cache else None
+        if cached is not None:
+            yield from parse_question_lines(cached)
+            return
+
+        content = []
+        buffer = ""
+        yielded = 0
+        for delta in self.transport.stream(**params):
+            content.append(delta)
+            buffer += delta
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                if QUESTION_LINE.match(line):
+                    yielded += 1
+                    yield line.strip()
+        if QUESTION_LINE.match(buffer):
+            yielded += 1
+            yield buffer.strip()
+        content = "".join(content)
+        self.cache.put(key, content)
+        if not yielded:
+            yield from parse_question_lines(content)
+
+    async def generate_questions_async(self, job_role, job_description, type, timeout=None, client=None,
+                                       count=DEFAULT_QUESTION_COUNT, use_cache=True):
+        """
+        Async variant of generate_questions with an optional per-attempt timeout in seconds.
+        use_cache=False forces a fresh completion (which is then cached).
+
+        A transport.async_client() opened on the running event loop can be passed
+        in to share its connection pool; otherwise one is opened for this call.
+        """
+        params = self._completion_params(job_role, job_description, type, count)
+        key = self.cache.fingerprint(**params)
+        cached = self.cache.get(key) if use_cache else None
+        if cached is not None:
+            return cached
+        if timeout is not None:
+            params["timeout"] = timeout
+
+        content = await self.transport.complete_async(client=client, **params)
+        self.cache.put(key, content)
+        return content
+
+    async def generate_many(self, requests, concurrency=4, timeout=60, use_cache=True):
+        """
+        Generate questions for many (role, JD, type) requests concurrently.
+
+        At most `concurrency` requests are in flight at once and each attempt times
+        out after `timeout` seconds (timeouts are retried by the transport). Yields a GenerationResult per request as soon as
+        it finishes, so results arrive in completion order, not input order.
+        use_cache=False bypasses the response cache for every request.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with self.transport.async_client() as client:
+            async def run(request):
+                async with semaphore:
+                    try:
+                        content = await self.generate_questions_async(
+                            *request, timeout=timeout, client=client, use_cache=use_cache
+                        )
+                        return GenerationResult(request, content, None)
+                    except Exception as e:
+                        return GenerationResult(request, None, e)
+
+            tasks = [asyncio.ensure_future(run(GenerationRequest(*request))) for request in requests]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    def generate_all(self, requests, concurrency=4, timeout=60):
+        """Blocking wrapper around generate_many; returns results in completion order."""
+        async def collect():
+            return [result async for result in self.generate_many(requests, concurrency, timeout)]
+        return asyncio.run(collect())
+
+    def _completion_params(self, job_role, job_description, type, count=DEFAULT_QUESTION_COUNT):
+        prompt = self._build_prompt(job_role, job_description, type, count)
+        return {
+            "model": MODEL_NAME,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7
+        }
+
+    def _build_prompt(self, job_role, job_description, type, count=DEFAULT_QUESTION_COUNT):
         prompt = ""
         if type == "DSA":
-            prompt = f"""Generate 10 comprehensive interview questions for a {job_role} position.
+            prompt = f"""Generate {count} comprehensive interview questions for a {job_role} position.
                 These questions must focus only on DSA and comprise of various difficulty levels
             """
         elif type == "Technical":
-            prompt = f"""Generate 10 comprehensive interview questions for a {job_role} position.
+            prompt = f"""Generate {count} comprehensive interview questions for a {job_role} position.
             These questions must focus on technical skills of the job role of {job_role} and comprise of various difficulty levels
             Focus on key aspects from the below job description: {job_description}
             """
         elif type == "Behaviour":
-            prompt = f"""Generate 10 comprehensive interview questions for a {job_role} position.
+            prompt = f"""Generate {count} comprehensive interview questions for a {job_role} position.
             These questions must focus on behavioral skills of the job role of {job_role} and comprise of
             various difficulty levels. Do not ask any technical questions."""
             # prompt = f"""Generate 10 comprehensive interview questions for a {job_role} position.
@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+
+from src.modules.module1_question_generation.utils.helpers import json_default
+
+DEFAULT_JOBS_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite")
+# Worker threads per queue; threads share the validators loaded in the process
+DEFAULT_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+# A running job whose owner has not renewed its lease for this long is requeued
+LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+IN_FLIGHT = (QUEUED, RUNNING)
+
+Job = namedtuple('Job', ['id', 'kind', 'params', 'status', 'stage', 'progress', 'partial', 'result', 'error',
+                         'created', 'updated'])
+
+
+def job_fingerprint(kind, params):
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=json_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JobContext:
+    """Handed to a job handler to publish its current stage, progress and partial results."""
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+
+    def report(self, stage, progress, partial=None):
+        """
+        Args:
+            stage (str): Name of the stage now running
+            progress (float): Overall completion in [0, 1]
+            partial (dict): Results available so far; replaces the previous partial
+        """
+        self.queue._update(self.job_id, stage=stage, progress=min(1.0, max(0.0, progress)), partial=partial)
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by SQLite with a pool of worker threads.
+
+    submit() returns a job id straight away; handlers registered per job kind
+    run on the workers and report progress through a JobContext. A job with the
+    same kind and parameters as one still queued or running is not enqueued
+    again; the existing id is returned instead.
+
+    Several processes may share one database. A claimed job records its queue's
+    owner id and a lease that a heartbeat thread renews; only jobs whose lease
+    has expired (their process died or hung) are requeued, so a job still
+    running elsewhere is never run twice.
+    """
+
+    def __init__(self, path=DEFAULT_JOBS_PATH, workers=DEFAULT_WORKERS, handlers=None,
+                 lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.workers = workers
+        self.handlers = dict(handlers or {})
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._stopped = threading.Event()
+        self._threads = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, fingerprint TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, stage TEXT, progress REAL NOT NULL DEFAULT 0, partial TEXT, result TEXT, "
+            "error TEXT, created REAL NOT NULL, updated REAL NOT NULL, owner TEXT, lease_expires REAL)"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+        for column, kind in (('owner', 'TEXT'), ('lease_expires', 'REAL')):
+            if column not in columns:
+                # Queues created before leases; their running rows count as expired
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint, status)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+        self._db.commit()
+
+    def register(self, kind, handler):
+        """handler(params, context) -> JSON-serializable result"""
+        self.handlers[kind] = handler
+
+    def start(self):
+        """Requeue jobs whose lease expired and start the worker and heartbeat threads."""
+        with self._lock:
+            if self._threads:
+                return self
+            self._requeue_expired()
+            self._db.commit()
+            self._stopping = False
+            self._stopped.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait=True):
+        with self._wakeup:
+            self._stopping = True
+            self._stopped.set()
+            self._wakeup.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, kind, params):
+        """Enqueue a job and return its id, or the id of an identical job still in flight."""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        fingerprint = job_fingerprint(kind, params)
+        with self._wakeup:
+            row = self._db.execute(
+                f"SELECT id FROM jobs WHERE fingerprint = ? AND status IN ({','.join('?' * len(IN_FLIGHT))}) "
+                "ORDER BY created LIMIT 1",
+                (fingerprint, *IN_FLIGHT)
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, fingerprint, params, status, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, fingerprint, json.dumps(params, default=json_default), QUEUED, now, now)
+            )
+            self._db.commit()
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id):
+        """Return the Job, or None for an unknown id."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, kind, params, status, stage, progress, partial, result, error, created, updated "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        values = list(row)
+        for i in (2, 6, 7):
+            values[i] = json.loads(values[i]) if values[i] is not None else None
+        return Job(*values)
+
+    def counts(self):
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def _requeue_expired(self):
+        # Called with the lock held; the caller commits
+        self._db.execute(
+            "UPDATE jobs SET status = ?, owner = NULL, lease_expires = NULL, updated = ? "
+            "WHERE status = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+            (QUEUED, time.time(), RUNNING, time.time())
+        )
+
+    def _claim(self):
+        # Called with the lock held
+        self._requeue_expired()
+        row = self._db.execute(
+            "SELECT id, kind, params FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+        ).fetchone()
+        if row is None:
+            return None
+        # Conditional update so a worker in another process cannot claim the same job
+        now = time.time()
+        claimed = self._db.execute(
+            "UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, updated = ? WHERE id = ? AND status = ?",
+            (RUNNING, self.owner, now + self.lease_seconds, now, row[0], QUEUED)
+        ).rowcount
+        self._db.commit()
+        return (row[0], row[1], json.loads(row[2])) if claimed else None
+
+    def _work(self):
+        while True:
+            with self._wakeup:
+                claimed = None
+                while not self._stopping:
+                    claimed = self._claim()
+                    if claimed is not None:
+                        break
+                    # Timed wait so jobs submitted by other processes are picked up too
+                    self._wakeup.wait(timeout=1.0)
+                if claimed is None:
+                    return
+            job_id, kind, params = claimed
+            try:
+                result = self.handlers[kind](params, JobContext(self, job_id))
+                self._update(job_id, status=DONE, progress=1.0, result=result)
+            except Exception as e:
+                print(f"Job {job_id} ({kind}) failed: {e}")
+                self._update(job_id, status=FAILED, error=str(e))
+
+    def _heartbeat(self):
+        # Renews the leases of every job this queue is running, several times per lease
+        while not self._stopped.wait(timeout=self.lease_seconds / 4):
+            with self._lock:
+                self._db.execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE owner = ? AND status = ?",
+                    (time.time() + self.lease_seconds, self.owner, RUNNING)
+                )
+                self._db.commit()
+
+    def _update(self, job_id, **fields):
+        for name in ('partial', 'result'):
+            if fields.get(name) is not None:
+                fields[name] = json.dumps(fields[name], default=json_default)
+        fields = {name: value for name, value in fields.items() if value is not None}
+        fields['updated'] = time.time()
+        # A job whose lease lapsed may have been claimed by another queue; leave it to that owner
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ? AND owner = ?",
+                (*fields.values(), job_id, self.owner)
+            )
+            self._db.commit()
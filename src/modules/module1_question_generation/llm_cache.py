@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite")
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions keyed by a prompt fingerprint.
+
+    An in-memory LRU sits in front of a SQLite table. Entries expire after `ttl`
+    seconds, and the table is trimmed to `max_disk_entries` by least recent access.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_entries=256, max_disk_entries=10000,
+                 ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._db.commit()
+
+    @staticmethod
+    def fingerprint(model, messages, temperature, **params):
+        """Hash everything that determines a completion into a cache key."""
+        payload = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'params': params
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached content for a key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[1], now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            row = self._db.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key, content):
+        """Store a completion in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, content, now)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created, last_access) VALUES (?, ?, ?, ?)",
+                (key, content, now, now)
+            )
+            overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_disk_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_entries': self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0],
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key, content, created):
+        self._memory[key] = (content, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide response cache at DEFAULT_CACHE_PATH."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
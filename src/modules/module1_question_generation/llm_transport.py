@@ -0,0 +1,288 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+import httpx
+import numpy as np
+from groq import Groq, AsyncGroq, APIConnectionError, InternalServerError, RateLimitError
+
+from src.modules.module1_question_generation.llm_cache import LLMResponseCache
+
+# Provider limits; the defaults match Groq's free tier for llama3-70b
+REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 30))
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", 6000))
+# Completion tokens budgeted per request when max_tokens is not given
+DEFAULT_COMPLETION_TOKENS = 1024
+# Connections kept open to the provider and shared by every call
+MAX_CONNECTIONS = 20
+# Retry policy: exponential backoff with full jitter, capped at BACKOFF_MAX seconds
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# Recent call latencies kept for stats()
+LATENCY_WINDOW = 1000
+
+# Throttling, connection/timeout failures and 5xx responses are worth another attempt
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """Rough token cost of a request: ~4 characters per prompt token plus the completion budget."""
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    acquire() reserves tokens immediately and returns how long the caller must
+    wait before using them, so sync callers can time.sleep() and async callers
+    can asyncio.sleep() on the same bucket. The full amount is always charged:
+    a request bigger than the capacity drives the balance into debt, and the
+    wait covers the refill of that debt.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Reserve `amount` tokens and return the seconds to wait until they are available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class LLMTransport:
+    """
+    Shared path for every chat completion call.
+
+    One pooled HTTP client is reused across calls. Requests and tokens per
+    minute are throttled with token buckets, retryable failures are retried
+    with jittered exponential backoff, identical requests already in flight
+    are coalesced onto one call, and per-call latency is recorded.
+    """
+
+    def __init__(self, api_key=None, base_url=None, requests_per_minute=REQUESTS_PER_MINUTE,
+                 tokens_per_minute=TOKENS_PER_MINUTE, max_retries=MAX_RETRIES, timeout=60,
+                 max_connections=MAX_CONNECTIONS):
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("API key not found. Please set GROQ_API_KEY in the .env file.")
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv("GROQ_BASE_URL")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        # Retries are handled here, so the SDK's own retry loop is switched off
+        self.client = Groq(
+            api_key=api_key, base_url=self.base_url, max_retries=0,
+            http_client=httpx.Client(limits=self.limits, timeout=timeout)
+        )
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.throttled_seconds = 0.0
+
+    def async_client(self):
+        """
+        AsyncGroq client for the running event loop, to be used as an async
+        context manager and passed to complete_async() to share its pool.
+        """
+        return AsyncGroq(
+            api_key=self.api_key, base_url=self.base_url, max_retries=0,
+            http_client=httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        )
+
+    def complete(self, model, messages, temperature, **params):
+        """Return the completion text, waiting on an identical in-flight request if there is one."""
+        key = LLMResponseCache.fingerprint(model, messages, temperature, **params)
+        future, owner = self._join(key)
+        if not owner:
+            return future.result()
+        try:
+            content = self._call(model, messages, temperature, params)
+            future.set_result(content)
+            return content
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave(key)
+
+    async def complete_async(self, model, messages, temperature, client=None, **params):
+        """Async complete(); `client` is an open async_client(), otherwise one is opened for the call."""
+        key = LLMResponseCache.fingerprint(model, messages, temperature, **params)
+        future, owner = self._join(key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            if client is None:
+                async with self.async_client() as client:
+                    content = await self._call_async(client, model, messages, temperature, params)
+            else:
+                content = await self._call_async(client, model, messages, temperature, params)
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave(key)
+
+    def stream(self, model, messages, temperature, **params):
+        """
+        Yield completion text deltas as they arrive.
+
+        Opening the stream is throttled and retried like any other call; once
+        content has started flowing a failure is raised to the caller. Latency
+        is recorded when the stream ends, also if the caller stops early.
+        """
+        start = time.perf_counter()
+        chunks = self._with_retries(
+            lambda: self.client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, stream=True, **params
+            ),
+            estimate_tokens(messages, params.get("max_tokens"))
+        )
+        try:
+            for chunk in chunks:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception:
+            self._count_failure()
+            raise
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def stats(self):
+        """Return call counters and latency percentiles in seconds."""
+        with self._lock:
+            latencies = np.array(self._latencies)
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'coalesced': self.coalesced,
+                'throttled_seconds': self.throttled_seconds,
+                'latency_mean': float(latencies.mean()) if len(latencies) else 0.0,
+                'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                'latency_p95': float(np.percentile(latencies, 95)) if len(latencies) else 0.0
+            }
+
+    def _join(self, key):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _leave(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _call(self, model, messages, temperature, params):
+        start = time.perf_counter()
+        response = self._with_retries(
+            lambda: self.client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, **params
+            ),
+            estimate_tokens(messages, params.get("max_tokens"))
+        )
+        self._record(time.perf_counter() - start)
+        return response.choices[0].message.content
+
+    async def _call_async(self, client, model, messages, temperature, params):
+        start = time.perf_counter()
+        tokens = estimate_tokens(messages, params.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._throttle(tokens))
+            try:
+                response = await client.chat.completions.create(
+                    model=model, messages=messages, temperature=temperature, **params
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                await asyncio.sleep(self._backoff(e, attempt))
+            except Exception:
+                self._count_failure()
+                raise
+        self._record(time.perf_counter() - start)
+        return response.choices[0].message.content
+
+    def _with_retries(self, request, tokens):
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._throttle(tokens))
+            try:
+                return request()
+            except RETRYABLE_ERRORS as e:
+                time.sleep(self._backoff(e, attempt))
+            except Exception:
+                self._count_failure()
+                raise
+
+    def _throttle(self, tokens):
+        wait = max(self.request_bucket.acquire(1), self.token_bucket.acquire(tokens))
+        if wait:
+            with self._lock:
+                self.throttled_seconds += wait
+        return wait
+
+    def _backoff(self, error, attempt):
+        """Delay before the next attempt; re-raises once the retries are used up."""
+        if attempt >= self.max_retries:
+            self._count_failure()
+            raise error
+        with self._lock:
+            self.retries += 1
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def _count_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def _record(self, latency):
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(base_url=None):
+    """Process-wide transport per endpoint (GROQ_BASE_URL or the public Groq API by default)."""
+    base_url = base_url or os.getenv("GROQ_BASE_URL")
+    with _transports_lock:
+        if base_url not in _transports:
+            _transports[base_url] = LLMTransport(base_url=base_url)
+        return _transports[base_url]
@@ -0,0 +1,163 @@
+import queue
+import threading
+
+# Marks the end of the question stream on the hand-off queue
+_STREAM_END = object()
+
+# Relevance (0-100) a Technical question needs before the question bank serves it again
+MIN_REUSABLE_RELEVANCE = 50
+# Orchestrator validator whose results have the score_batch format of a question type.
+# Behaviour scores are only validity flags, so the bias validator still runs for them
+TYPE_VALIDATORS = {"DSA": "dsa", "Technical": "relevance"}
+
+
+def score_batch(question_type, jd_text, questions, analyzer, similarity_model):
+    """
+    Score questions with the validator for their type.
+
+    DSA questions get their similarity result dict, Technical questions their
+    relevance score and Behaviour questions their bias validity (1 = biased).
+    """
+    if question_type == "DSA":
+        return similarity_model.check_similarity(questions)
+    if question_type == "Technical":
+        return analyzer.calculate_question_scores(jd_text, questions)
+    if question_type == "Behaviour":
+        from src.modules.module4_bias.bias import screen_questions
+        return screen_questions(questions)[3]
+    raise ValueError(f"Unknown question type '{question_type}'")
+
+
+def is_reusable(question_type, score):
+    """Whether a scored question may be served again from the question bank."""
+    if question_type == "Technical":
+        return score >= MIN_REUSABLE_RELEVANCE
+    return not (question_type == "Behaviour" and score == 1)
+
+
+def build_validator(question_type, jd_text, analyzer, similarity_model):
+    """
+    Return a function scoring a single question.
+
+    Technical questions are scored with the analyzer's fixed_tfidf() weights
+    (the background model, or a vectorizer fitted once on the JD), since a
+    per-question fit is meaningless. Without a background model their TF-IDF
+    component, and so their relevance, can differ from score_batch, which fits
+    on the JD plus the whole batch. DSA and Behaviour scores match score_batch.
+    """
+    if question_type == "Technical":
+        tfidf = analyzer.fixed_tfidf(jd_text)
+        return lambda question: analyzer.calculate_question_scores(jd_text, [question], tfidf=tfidf)[0]
+    if question_type not in ("DSA", "Behaviour"):
+        raise ValueError(f"Unknown question type '{question_type}'")
+    return lambda question: score_batch(question_type, jd_text, [question], analyzer, similarity_model)[0]
+
+
+def stream_scored_questions(questions, validator, limit=None):
+    """
+    Score questions while they are still being generated.
+
+    A reader thread drains the `questions` iterator (e.g. GroqClient.stream_questions)
+    into a queue, so the LLM stream keeps flowing while the caller's thread runs
+    the validator on each question as soon as it arrives. Questions beyond
+    `limit` are drained without being scored or yielded, so the stream still
+    completes (and is cached) when the LLM returns more than asked for.
+
+    Yields:
+        tuple: (question, score) in generation order
+    """
+    handoff = queue.Queue()
+
+    def read():
+        try:
+            for question in questions:
+                handoff.put(question)
+        except Exception as e:
+            handoff.put(e)
+        finally:
+            handoff.put(_STREAM_END)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    yielded = 0
+    while True:
+        item = handoff.get()
+        if item is _STREAM_END:
+            break
+        if isinstance(item, Exception):
+            raise item
+        if limit is not None and yielded >= limit:
+            continue
+        yielded += 1
+        yield item, validator(item)
+    reader.join()
+
+
+def run_analysis(job_role, jd_text, question_type, client, analyzer, similarity_model, bank=None,
+                 count=None, stream=False, report=None):
+    """
+    Title check, question-bank reuse, generation of the shortfall and scoring for one request.
+
+    Args:
+        client (GroqClient): LLM client for the questions the bank cannot supply
+        bank (QuestionBank): Source of reusable questions; None generates everything
+        stream (bool): Stream generation and score each question as it completes
+        report (callable): report(stage, progress, partial) hook, e.g. JobContext.report;
+            partial holds the questions and scores available so far. Progress stays
+            at or below 0.9, leaving the rest for stages the caller runs afterwards
+
+    Returns:
+        dict: title_match flag, questions, scores, how many were reused from the bank and
+            the raw LLM completion for the generated ones ("" when the bank supplied all)
+    """
+    from src.modules.module1_question_generation.groq_client import (
+        DEFAULT_QUESTION_COUNT, parse_question_lines, strip_question_number
+    )
+    count = count or DEFAULT_QUESTION_COUNT
+    report = report or (lambda stage, progress, partial=None: None)
+
+    report("title_match", 0.05)
+    if not analyzer.check_title_jd_match(job_role, jd_text):
+        return {'title_match': False, 'questions': [], 'scores': [], 'reused': 0, 'completion': ""}
+
+    report("question_bank", 0.1)
+    reused = bank.lookup(job_role, jd_text, question_type, count) if bank is not None else []
+    questions = [entry.question for entry in reused]
+    scores = [entry.score for entry in reused]
+    shortfall = count - len(reused)
+
+    new_lines, new_scores = [], []
+    completion = ""
+    if shortfall > 0 and stream:
+        validator = build_validator(question_type, jd_text, analyzer, similarity_model)
+        question_stream = client.stream_questions(job_role, jd_text, question_type, count=shortfall)
+        streamed = []
+        for question, score in stream_scored_questions(question_stream, validator, limit=shortfall):
+            streamed.append(question)
+            new_lines.append(strip_question_number(question))
+            new_scores.append(score)
+            report("generation", min(1.0, 0.2 + 0.7 * len(new_lines) / shortfall),
+                   {'questions': questions + new_lines, 'scores': scores + new_scores})
+        # The consumed stream left the whole completion, headers included, in the response cache
+        completion = client.cached_completion(job_role, jd_text, question_type, count=shortfall)
+        if completion is None:
+            completion = "\n".join(streamed)
+    elif shortfall > 0:
+        report("generation", 0.2, {'questions': questions, 'scores': scores})
+        content = client.generate_questions(job_role, jd_text, question_type, count=shortfall)
+        completion = content
+        new_lines = parse_question_lines(content)
+        new_lines = [strip_question_number(q) for q in new_lines[:shortfall]]
+        report("scoring", 0.6, {'questions': questions + new_lines, 'scores': scores})
+        new_scores = list(score_batch(question_type, jd_text, new_lines, analyzer, similarity_model))
+
+    if bank is not None:
+        bank.add(job_role, jd_text, question_type, new_lines, new_scores,
+                 valid=[is_reusable(question_type, score) for score in new_scores])
+    return {
+        'title_match': True,
+        'questions': questions + new_lines,
+        'scores': scores + new_scores,
+        'reused': len(reused),
+        'completion': completion
+    }
@@ -1,26 +1,22 @@
 
 PROJECTS_DIR = "projects"
 DATASET_DIR = "dataset"
-import json
-import os
+
+from src.modules.project_store import get_project_store
 
 class Project:
     def __init__(self):
-        pass
+        # Projects live in the shared SQLite store; projects/*.json are migrated on first use
+        self.store = get_project_store()
     def list_projects(self):
-        return [f.replace(".json", "") for f in os.listdir(PROJECTS_DIR) if f.endswith(".json")]
+        return self.store.list_projects()
 
     def load_project(self,project_name):
-        file_path = os.path.join(PROJECTS_DIR, f"{project_name}.json")
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                return json.load(f)
-        return None
+        return self.store.load(project_name)
 
     def save_project(self,project_name, data):
-        file_path = os.path.join(PROJECTS_DIR, f"{project_name}.json")
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        # Only history entries added since the project was loaded are written
+        self.store.save(project_name, data)
 
     def initialize_project(self,project_name):
         data = {
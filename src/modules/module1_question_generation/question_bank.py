@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from src.modules.encoder_registry import get_encoder
+from src.modules.module1_question_generation.utils.helpers import json_default
+
+DEFAULT_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "question_bank.sqlite")
+# Cosine similarity a stored JD / role must reach for its questions to be reused
+JD_SIMILARITY_THRESHOLD = 0.9
+ROLE_SIMILARITY_THRESHOLD = 0.85
+# Questions at least this similar to one already picked count as near-duplicates
+QUESTION_SIMILARITY_THRESHOLD = 0.9
+# Prompts for these types never include the JD, so their questions are reused by role alone
+ROLE_ONLY_TYPES = ("DSA", "Behaviour")
+
+# A reusable question with its stored validator score and the JD/role similarity it was found at
+BankEntry = namedtuple('BankEntry', ['question', 'score', 'jd_similarity', 'role_similarity'])
+
+
+def hash_jd(jd_text):
+    return hashlib.sha256(" ".join(jd_text.split()).encode('utf-8')).hexdigest()
+
+
+class QuestionBank:
+    """
+    Persistent store of generated questions and their validator scores.
+
+    Each question is saved with its role, type, JD fingerprint and its own,
+    role and JD embeddings from the shared encoder. lookup() returns stored
+    questions whose role and JD are both close to the new request (only the
+    role for ROLE_ONLY_TYPES), skipping near-duplicates of questions already
+    picked, so only the shortfall has to be generated and scored. Embeddings
+    are kept in memory per question type for the nearest-neighbour scan and
+    reloaded when rows were added, also by another process.
+    """
+
+    def __init__(self, path=DEFAULT_BANK_PATH, encoder=None, jd_threshold=JD_SIMILARITY_THRESHOLD,
+                 role_threshold=ROLE_SIMILARITY_THRESHOLD, question_threshold=QUESTION_SIMILARITY_THRESHOLD):
+        self.path = path
+        self.encoder = encoder or get_encoder()
+        self.jd_threshold = jd_threshold
+        self.role_threshold = role_threshold
+        self.question_threshold = question_threshold
+        self._lock = threading.Lock()
+        self._vectors = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY, question TEXT NOT NULL, question_type TEXT NOT NULL, "
+            "job_role TEXT NOT NULL, jd_hash TEXT NOT NULL, role_embedding BLOB NOT NULL, "
+            "jd_embedding BLOB NOT NULL, score TEXT, valid INTEGER NOT NULL, created REAL NOT NULL, "
+            "question_embedding BLOB, UNIQUE (question_type, jd_hash, question))"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(questions)")]
+        if 'question_embedding' not in columns:
+            # Banks created before question embeddings were stored; filled in on first load
+            self._db.execute("ALTER TABLE questions ADD COLUMN question_embedding BLOB")
+        self._db.execute("CREATE INDEX IF NOT EXISTS questions_type ON questions (question_type, valid)")
+        self._db.commit()
+
+    def lookup(self, job_role, jd_text, question_type, count):
+        """
+        Find up to `count` valid stored questions for a similar role and JD.
+        The JD is ignored for ROLE_ONLY_TYPES.
+
+        Returns:
+            list: BankEntry objects, closest JD/role first, without duplicate or
+                near-duplicate questions
+        """
+        ids, roles, jds, questions = self._load_vectors(question_type)
+        if not len(ids) or count <= 0:
+            return []
+        role_embedding, jd_embedding = self._embed(job_role, jd_text)
+        role_similarity = roles @ role_embedding
+        jd_similarity = jds @ jd_embedding
+        if question_type in ROLE_ONLY_TYPES:
+            matches = np.flatnonzero(role_similarity >= self.role_threshold)
+            closeness = role_similarity
+        else:
+            matches = np.flatnonzero((role_similarity >= self.role_threshold) & (jd_similarity >= self.jd_threshold))
+            closeness = role_similarity + jd_similarity
+        if not len(matches):
+            return []
+        matches = matches[np.argsort(-closeness[matches], kind='stable')]
+
+        with self._lock:
+            rows = dict(
+                (row[0], row[1:]) for row in self._db.execute(
+                    f"SELECT id, question, score FROM questions WHERE id IN ({','.join('?' * len(matches))})",
+                    [int(ids[i]) for i in matches]
+                )
+            )
+        entries = []
+        picked = []
+        for i in matches:
+            question, score = rows[int(ids[i])]
+            if picked and (questions[picked] @ questions[i]).max() >= self.question_threshold:
+                continue
+            picked.append(i)
+            entries.append(BankEntry(
+                question, json.loads(score) if score is not None else None,
+                float(jd_similarity[i]), float(role_similarity[i])
+            ))
+            if len(entries) == count:
+                break
+        return entries
+
+    def add(self, job_role, jd_text, question_type, questions, scores, valid=None):
+        """
+        Store validated questions for a role/JD.
+
+        Args:
+            questions (list): Question texts
+            scores (list): Validator result per question (JSON-serializable)
+            valid (list): Whether each question may be reused; defaults to all True
+        """
+        if not questions:
+            return 0
+        valid = valid if valid is not None else [True] * len(questions)
+        role_embedding, jd_embedding = self._embed(job_role, jd_text)
+        question_embeddings = self.encoder.encode(list(questions))
+        jd_hash = hash_jd(jd_text)
+        now = time.time()
+        rows = [
+            (question, question_type, job_role, jd_hash, role_embedding.tobytes(), jd_embedding.tobytes(),
+             json.dumps(score, default=json_default), int(bool(is_valid)), now, question_embedding.tobytes())
+            for question, score, is_valid, question_embedding in zip(questions, scores, valid, question_embeddings)
+        ]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO questions (question, question_type, job_role, jd_hash, role_embedding, "
+                "jd_embedding, score, valid, created, question_embedding) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+            added = self._db.total_changes - before
+            # Reloaded with the new rows on the next lookup
+            self._vectors.pop(question_type, None)
+        return added
+
+    def stats(self):
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT question_type, COUNT(*) FROM questions GROUP BY question_type"
+            ).fetchall())
+
+    def _embed(self, job_role, jd_text):
+        role_embedding, jd_embedding = self.encoder.encode([job_role, jd_text])
+        return role_embedding, jd_embedding
+
+    def _load_vectors(self, question_type):
+        with self._lock:
+            # Row count and newest id change whenever any process adds rows for this type
+            version = self._db.execute(
+                "SELECT COUNT(*), MAX(id) FROM questions WHERE question_type = ? AND valid = 1", (question_type,)
+            ).fetchone()
+            cached = self._vectors.get(question_type)
+            if cached is None or cached[0] != version:
+                rows = self._db.execute(
+                    "SELECT id, role_embedding, jd_embedding, question_embedding, question FROM questions "
+                    "WHERE question_type = ? AND valid = 1",
+                    (question_type,)
+                ).fetchall()
+                rows = self._fill_question_embeddings(rows)
+                dimension = self.encoder.dimension
+                ids = np.array([row[0] for row in rows], dtype=np.int64)
+                roles = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.float32).reshape(-1, dimension)
+                jds = np.frombuffer(b''.join(row[2] for row in rows), dtype=np.float32).reshape(-1, dimension)
+                questions = np.frombuffer(b''.join(row[3] for row in rows), dtype=np.float32).reshape(-1, dimension)
+                self._vectors[question_type] = (version, (ids, roles, jds, questions))
+            return self._vectors[question_type][1]
+
+    def _fill_question_embeddings(self, rows):
+        # Called with the lock held; encodes and stores embeddings missing from older rows
+        missing = [i for i, row in enumerate(rows) if row[3] is None]
+        if not missing:
+            return rows
+        embeddings = self.encoder.encode([rows[i][4] for i in missing])
+        rows = [list(row) for row in rows]
+        for i, embedding in zip(missing, embeddings):
+            rows[i][3] = embedding.tobytes()
+        self._db.executemany(
+            "UPDATE questions SET question_embedding = ? WHERE id = ?", [(rows[i][3], rows[i][0]) for i in missing]
+        )
+        self._db.commit()
+        return rows
+
+
+_shared_bank = None
+_shared_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    """Process-wide question bank at DEFAULT_BANK_PATH."""
+    global _shared_bank
+    with _shared_bank_lock:
+        if _shared_bank is None:
+            _shared_bank = QuestionBank()
+        return _shared_bank
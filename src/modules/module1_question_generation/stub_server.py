@@ -0,0 +1,118 @@
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Path the Groq SDK posts chat completions to, relative to its base_url
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+def stub_questions(prompt, count=10):
+    """Deterministic 'Q<n>.' question lines derived from the prompt."""
+    match = re.search(r"for a (.+?) position", prompt)
+    role = match.group(1) if match else "this role"
+    requested = re.search(r"Generate (\d+) ", prompt)
+    count = int(requested.group(1)) if requested else count
+    return "\n".join(
+        f"Q{i}. Stub question {i} about the responsibilities of a {role}?" for i in range(1, count + 1)
+    )
+
+
+class StubCompletionsHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests with an OpenAI-compatible payload."""
+
+    delay = 0.0
+    stream_delay = 0.0
+
+    def do_POST(self):
+        if self.path.rstrip("/") != COMPLETIONS_PATH:
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        if self.delay:
+            time.sleep(self.delay)
+        content = stub_questions(prompt)
+        if body.get("stream"):
+            self._stream(body, content)
+            return
+        payload = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4}
+        }
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body, content):
+        """Send the completion as server-sent events, one line per chunk."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        pieces = [line + "\n" for line in content.split("\n")]
+        for i, piece in enumerate(pieces):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": piece},
+                    "finish_reason": "stop" if i == len(pieces) - 1 else None
+                }]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if self.stream_delay:
+                time.sleep(self.stream_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host="127.0.0.1", port=0, delay=0.0, stream_delay=0.0):
+    """
+    Start the stub completions server on a background thread.
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() to stop it
+    """
+    handler = type("StubHandler", (StubCompletionsHandler,), {"delay": delay, "stream_delay": stream_delay})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub of the Groq chat completions endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--stream-delay", type=float, default=0.0, help="Seconds between streamed lines")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.host, args.port, args.delay, args.stream_delay)
+    print(f"Stub completions server listening; set GROQ_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
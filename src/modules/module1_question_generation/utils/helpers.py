@@ -0,0 +1,3 @@
+def json_default(value):
+    """json.dumps fallback for validator results: numpy scalars become Python numbers, anything else a string."""
+    return value.item() if hasattr(value, 'item') else str(value)
@@ -0,0 +1,125 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class JDFeatureCache:
+    """
+    Content-addressed cache of features derived from a job description.
+
+    Entries are keyed by a SHA-256 hash of the JD text and hold a dict of named
+    features (keywords, cleaned text, parsed entities, embeddings, ...). An in-memory
+    LRU bounded by `max_entries` sits in front of an optional on-disk tier with one
+    pickle file per JD.
+    """
+
+    def __init__(self, max_entries=128, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(jd_text):
+        """Hash the JD text into a cache key."""
+        return hashlib.sha256(jd_text.encode('utf-8')).hexdigest()
+
+    def get_feature(self, jd_text, name, compute):
+        """
+        Return a named feature for the JD, computing and caching it on a miss.
+
+        Args:
+            jd_text (str): The job description text
+            name (str): Feature name, e.g. 'keywords' or 'embedding'
+            compute (callable): Zero-argument function producing the feature
+        """
+        key = self.key(jd_text)
+        with self._lock:
+            entry = self._lookup(key)
+            if name in entry:
+                self.hits += 1
+                return entry[name]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            entry = self._lookup(key)
+            entry[name] = value
+            self._store(key, entry)
+        return value
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the memory tier."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        """Drop every in-memory entry; the disk tier is left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key):
+        """Fetch the entry dict for a key from memory, then disk, creating it if absent."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        entry = self._read_disk(key)
+        if entry is not None:
+            self.disk_hits += 1
+        else:
+            entry = {}
+        self._entries[key] = entry
+        self._evict()
+        return entry
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+        self._write_disk(key, entry)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f)
+        os.replace(tmp_path, path)
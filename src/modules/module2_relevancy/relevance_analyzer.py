@@ -1,7 +1,4 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 from rake_nltk import Rake
 import nltk
 import importlib.util
@@ -10,6 +7,45 @@ import subprocess
 import logging
 import re
 import os
+import threading
+from collections import namedtuple
+
+from src.modules.encoder_registry import get_encoder
+from src.modules.module2_relevancy.tfidf_model import TfidfModel
+from src.modules.module2_relevancy.jd_cache import JDFeatureCache
+
+# spaCy components whose output the relevance scorers never read
+SPACY_UNUSED_COMPONENTS = ('lemmatizer', 'textcat', 'senter')
+
+# Features read from a single spaCy parse of a document
+ParsedFeatures = namedtuple('ParsedFeatures', ['entities', 'noun_chunks'])
+
+# Component weights for the final relevance score
+SCORE_WEIGHTS = {
+    'tfidf': 0.15,      # Term frequency importance
+    'semantic': 0.35,   # Semantic meaning importance
+    'keyword': 0.20,    # Keyword matching importance
+    'entity': 0.15,     # Named entity importance
+    'context': 0.15     # Contextual relevance importance
+}
+
+# Weights used when spaCy is unavailable and entity/context scores are missing
+FALLBACK_SCORE_WEIGHTS = {
+    'tfidf': 0.25,
+    'semantic': 0.45,
+    'keyword': 0.30
+}
+
+# Per-question record returned by EnhancedRelevanceAnalyzer.score_questions
+SCORE_DTYPE = np.dtype([
+    ('tfidf', np.float32),
+    ('semantic', np.float32),
+    ('keyword', np.float32),
+    ('entity', np.float32),
+    ('context', np.float32),
+    ('keyword_overlap', np.int32),
+    ('final', np.float32)
+])
 
 class NLTKResourceManager:
     """Manages NLTK resource initialization and verification"""
@@ -56,16 +92,26 @@ class EnhancedRelevanceAnalyzer:
     using multiple NLP techniques and scoring mechanisms.
     """
     
-    def __init__(self):
-        """Initialize the analyzer with necessary models and vectorizers."""
-        self.tfidf = TfidfVectorizer(
-            stop_words='english', 
-            ngram_range=(1, 3),
-            max_features=5000
-        )
+    def __init__(self, tfidf_model_path=None, jd_cache=None):
+        """
+        Initialize the analyzer with necessary models and vectorizers.
+        
+        Args:
+            tfidf_model_path (str): Optional persisted background TF-IDF model. When
+                missing, TF-IDF is fitted once per scoring call instead.
+            jd_cache (JDFeatureCache): Cache for JD-derived features, shared across calls
+        """
+        self.jd_cache = jd_cache if jd_cache is not None else JDFeatureCache()
+        if tfidf_model_path and os.path.exists(tfidf_model_path):
+            self.tfidf = TfidfModel.load(tfidf_model_path)
+        else:
+            self.tfidf = TfidfModel()
         NLTKResourceManager.initialize_nltk_resources()
-        self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.encoder = get_encoder('all-MiniLM-L6-v2')
+        self.semantic_model = self.encoder.model
         self.keyword_extractor = Rake()
+        # Rake keeps the last text's phrases on the instance, so job worker threads take turns
+        self._keyword_lock = threading.Lock()
         
         # Initialize spaCy with proper error handling
         self.nlp = self._initialize_spacy()
@@ -92,135 +138,201 @@ class EnhancedRelevanceAnalyzer:
         
     def check_title_jd_match(self, job_title, jd_text, threshold=0.45):
         """Check semantic match between job title and JD using sentence transformers"""
-        title_embed = self.semantic_model.encode([job_title], convert_to_tensor=True)
-        jd_embed = self.semantic_model.encode([jd_text[:5000]], convert_to_tensor=True)  # Use first 5000 chars for efficiency
-        similarity = cosine_similarity(title_embed, jd_embed)[0][0]
+        title_embed = self._encode([job_title])[0]
+        jd_embed = self.jd_cache.get_feature(
+            jd_text, 'title_match_embedding',
+            lambda: self._encode([jd_text[:5000]])[0]  # Use first 5000 chars for efficiency
+        )
+        similarity = float(title_embed @ jd_embed)
         return similarity >= threshold
 
-    def calculate_question_scores(self, job_description, questions):
+    def calculate_question_scores(self, job_description, questions, docs=None, tfidf=None):
         """
         Calculate relevance scores for a list of questions against a job description.
         
         Args:
             job_description (str): The job description text
             questions (list): List of question strings to analyze
+            docs (list): Optional spaCy Docs of the questions from parse()
+            tfidf (TfidfModel): Optional TF-IDF model overriding self.tfidf, e.g. from fixed_tfidf()
             
         Returns:
             list: List of relevance scores (0-100) for each question
         """
-        # Extract key phrases using RAKE
-        self.keyword_extractor.extract_keywords_from_text(job_description)
-        jd_keywords = set(self.keyword_extractor.get_ranked_phrases()[:20])
-        print('HEYY')
-        print(jd_keywords)
-        # Extract entities if spaCy is available
-        jd_entities = set()
-        if self.nlp:
-            jd_doc = self.nlp(job_description)
-            jd_entities = set([ent.text.lower() for ent in jd_doc.ents])
-        
-        # Clean and prepare texts
-        jd_clean = self._clean_text(job_description)
-        questions_clean = [self._clean_text(q) for q in questions]
-        
-        # Calculate scores for each question
-        scores = []
-        for i, question in enumerate(questions):
-            # Calculate base scores
-            tfidf_score = self._calculate_tfidf_score(jd_clean, questions_clean[i])
-            semantic_score = self._calculate_semantic_score(jd_clean, questions_clean[i])
-            keyword_score = self._calculate_keyword_score(jd_keywords, question)
+        scores = self.score_questions(job_description, questions, docs=docs, tfidf=tfidf)
+        return [round(float(score) * 100, 2) for score in scores['final']]
+    
+    def score_questions(self, job_description, questions, docs=None, tfidf=None):
+        """
+        Score a whole batch of questions against a job description.
+        
+        Every component is computed as a vector over the batch, then weighted and
+        normalized with vector operations.
+        
+        Args:
+            job_description (str): The job description text
+            questions (list): List of question strings to analyze
+            docs (list): Optional spaCy Docs of the questions from parse(), so a
+                caller sharing the parse with other validators skips re-parsing
+            tfidf (TfidfModel): Optional TF-IDF model overriding self.tfidf
             
-            question_words = set(self._clean_text(question).split())
-            keyword_overlap = len(jd_keywords & question_words)
-            # Calculate additional scores if spaCy is available
-            if self.nlp:
-                entity_score = self._calculate_entity_score(jd_entities, question)
-                context_score = self._calculate_context_score(job_description, question)
-                
-                # Combine all scores with weights
-                weighted_score = (
-                    tfidf_score * 0.15 +      # Term frequency importance
-                    semantic_score * 0.35 +    # Semantic meaning importance
-                    keyword_score * 0.20 +     # Keyword matching importance
-                    entity_score * 0.15 +      # Named entity importance
-                    context_score * 0.15       # Contextual relevance importance
-                )
+        Returns:
+            np.ndarray: Structured array (SCORE_DTYPE) with the component scores,
+                keyword overlap and final score (0-1) for each question
+        """
+        questions = list(questions)
+        results = np.zeros(len(questions), dtype=SCORE_DTYPE)
+        if not questions:
+            return results
+        
+        # JD-derived features are reused from the cache when the JD was seen before
+        jd_keywords = self.jd_cache.get_feature(
+            job_description, 'keywords', lambda: self._extract_keywords(job_description)
+        )
+        jd_clean = self.jd_cache.get_feature(
+            job_description, 'clean_text', lambda: self._clean_text(job_description)
+        )
+        jd_embedding = self.jd_cache.get_feature(
+            job_description, 'embedding', lambda: self._encode([jd_clean])[0]
+        )
+        
+        # Clean and tokenize every question exactly once
+        questions_clean = self.embedding_texts(questions)
+        question_words = [set(q.split()) for q in questions_clean]
+        keyword_overlap = np.array([len(jd_keywords & words) for words in question_words], dtype=np.int32)
+        word_counts = np.array([len(words) for words in question_words], dtype=np.int32)
+        
+        results['tfidf'] = (tfidf or self.tfidf).score(jd_clean, questions_clean)
+        results['semantic'] = self._calculate_semantic_scores(jd_embedding, questions_clean)
+        results['keyword'] = self._calculate_keyword_scores(keyword_overlap, word_counts, len(jd_keywords))
+        results['keyword_overlap'] = keyword_overlap
+        
+        # Parse the JD (once per distinct JD) and all questions together if spaCy is available
+        if self.nlp:
+            jd_features = self.jd_cache.get_feature(
+                job_description, 'parsed', lambda: self._parse_documents([job_description])[0]
+            )
+            if docs is not None:
+                question_features = [self._document_features(doc) for doc in docs]
             else:
-                # Fallback scoring without spaCy-dependent components
-                weighted_score = (
-                    tfidf_score * 0.25 +
-                    semantic_score * 0.45 +
-                    keyword_score * 0.30
-                )
-            
-            # Normalize and boost the final score
-            final_score = self._normalize_and_boost_score(weighted_score, keyword_overlap)
-            scores.append(final_score)
-            
-        return [round(score * 100, 2) for score in scores]
+                question_features = self._parse_documents(questions)
+            results['entity'] = self._calculate_entity_scores(
+                jd_features.entities, [features.entities for features in question_features]
+            )
+            results['context'] = self._calculate_context_scores(
+                jd_features.noun_chunks, [features.noun_chunks for features in question_features]
+            )
+            weights = SCORE_WEIGHTS
+        else:
+            # Fallback scoring without spaCy-dependent components
+            weights = FALLBACK_SCORE_WEIGHTS
+        
+        weighted_scores = sum(results[name] * weight for name, weight in weights.items())
+        results['final'] = self._normalize_and_boost_scores(weighted_scores, keyword_overlap)
+        return results
+    
+    def fixed_tfidf(self, job_description):
+        """
+        TF-IDF model with weights that do not depend on the questions scored.
+        
+        This is the background model when one is loaded, else a vectorizer fitted
+        once on the JD. Scoring questions one at a time with a per-call fit would
+        give every question an IDF from a two-document corpus.
+        """
+        if self.tfidf.is_background:
+            return self.tfidf
+        
+        def fit():
+            jd_clean = self.jd_cache.get_feature(
+                job_description, 'clean_text', lambda: self._clean_text(job_description)
+            )
+            try:
+                return TfidfModel.fit_background([jd_clean])
+            except ValueError:
+                # Empty vocabulary; the per-call fit scores zeros as well
+                return TfidfModel()
+        
+        return self.jd_cache.get_feature(job_description, 'tfidf_model', fit)
+    
+    def embedding_texts(self, questions):
+        """The cleaned question texts that are embedded for semantic scoring."""
+        return [self._clean_text(q) for q in questions]
     
-    def _calculate_tfidf_score(self, jd_text, question):
-        """Calculate TF-IDF based similarity score."""
-        tfidf_matrix = self.tfidf.fit_transform([jd_text, question])
-        return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+    def parse(self, texts):
+        """Run the spaCy pipeline over texts, skipping components the scorers don't read."""
+        disabled = [name for name in SPACY_UNUSED_COMPONENTS if name in self.nlp.pipe_names]
+        return list(self.nlp.pipe(texts, disable=disabled))
     
-    def _calculate_semantic_score(self, jd_text, question):
-        """Calculate semantic similarity using sentence transformers."""
-        jd_embedding = self.semantic_model.encode([jd_text], convert_to_tensor=True)
-        question_embedding = self.semantic_model.encode([question], convert_to_tensor=True)
-        return cosine_similarity(jd_embedding, question_embedding)[0][0]
+    def _encode(self, texts):
+        """Encode texts into L2-normalized float32 embeddings."""
+        return self.encoder.encode(texts)
     
-    def _calculate_keyword_score(self, jd_keywords, question):
+    def _extract_keywords(self, job_description):
+        """Extract the top JD key phrases using RAKE."""
+        with self._keyword_lock:
+            self.keyword_extractor.extract_keywords_from_text(job_description)
+            return set(self.keyword_extractor.get_ranked_phrases()[:20])
+    
+    def _calculate_semantic_scores(self, jd_embedding, questions):
+        """
+        Calculate semantic similarity of every question against the JD embedding.
+        
+        All questions are encoded in a single batch; since the embeddings are
+        normalized, cosine similarity is one matrix-vector product.
+        """
+        if not questions:
+            return np.zeros(0, dtype=np.float32)
+        question_embeddings = self._encode(questions)
+        return question_embeddings @ jd_embedding
+    
+    def _calculate_keyword_scores(self, keyword_overlap, word_counts, keyword_count):
         """Enhanced keyword scoring with threshold-based boosting"""
-        question_words = set(self._clean_text(question).split())
-        overlap = len(jd_keywords & question_words)
+        overlap = keyword_overlap.astype(np.float32)
         
         # Base score calculation
-        base_score = min(1.0, overlap / max(len(jd_keywords)*0.25, 1))
+        scores = np.minimum(1.0, overlap / max(keyword_count * 0.25, 1))
         
         # Threshold-based boosting
-        if overlap >= 3:  # Absolute threshold
-            base_score = min(1.0, base_score * 1.25)
-        if len(question_words) > 0 and (overlap/len(question_words)) >= 0.25:  # Relative threshold
-            base_score = min(1.0, base_score * 1.15)
-        return base_score
-    
-    def _calculate_entity_score(self, jd_entities, question):
-        """Calculate named entity overlap score."""
-        if not self.nlp:
-            return 0.0
-        question_doc = self.nlp(question)
-        question_entities = set([ent.text.lower() for ent in question_doc.ents])
-        overlap = len(jd_entities & question_entities)
-        return min(1.0, overlap / max(len(jd_entities) * 0.2, 1))
-    
-    def _calculate_context_score(self, job_description, question):
-        """Calculate contextual relevance score using noun phrases."""
-        if not self.nlp:
-            return 0.0
-        jd_doc = self.nlp(job_description)
-        question_doc = self.nlp(question)
-        
-        # Extract noun phrases
-        jd_phrases = set([chunk.text.lower() for chunk in jd_doc.noun_chunks])
-        question_phrases = set([chunk.text.lower() for chunk in question_doc.noun_chunks])
+        absolute = keyword_overlap >= 3  # Absolute threshold
+        scores = np.where(absolute, np.minimum(1.0, scores * 1.25), scores)
+        relative = (word_counts > 0) & (overlap >= 0.25 * word_counts)  # Relative threshold
+        scores = np.where(relative, np.minimum(1.0, scores * 1.15), scores)
+        return scores
+    
+    def _parse_documents(self, texts):
+        """
+        Parse texts in a single nlp.pipe pass and extract the features the scorers share.
         
+        Returns:
+            list: One ParsedFeatures (lowercased entity and noun chunk sets) per text
+        """
+        return [self._document_features(doc) for doc in self.parse(texts)]
+    
+    def _document_features(self, doc):
+        return ParsedFeatures(
+            entities=set(ent.text.lower() for ent in doc.ents),
+            noun_chunks=set(chunk.text.lower() for chunk in doc.noun_chunks)
+        )
+    
+    def _calculate_entity_scores(self, jd_entities, question_entities):
+        """Calculate named entity overlap scores."""
+        overlap = np.array([len(jd_entities & entities) for entities in question_entities], dtype=np.float32)
+        return np.minimum(1.0, overlap / max(len(jd_entities) * 0.2, 1))
+    
+    def _calculate_context_scores(self, jd_phrases, question_phrases):
+        """Calculate contextual relevance scores using noun phrases."""
+        overlap = np.array([len(jd_phrases & phrases) for phrases in question_phrases], dtype=np.float32)
         # Calculate phrase overlap with boosting
-        phrase_overlap = len(jd_phrases & question_phrases) / max(len(jd_phrases), 1)
-        return min(1.0, phrase_overlap * 1.5)
+        return np.minimum(1.0, overlap / max(len(jd_phrases), 1) * 1.5)
     
-    def _normalize_and_boost_score(self, score,keyword_overlap):
+    def _normalize_and_boost_scores(self, scores, keyword_overlap):
         """Enhanced normalization with keyword-based boosting"""
         # Sigmoid normalization
-        normalized = 1 / (1 + np.exp(-6 * (score - 0.5)))
+        normalized = 1 / (1 + np.exp(-6 * (scores - 0.5)))
         
         # Additional boost based on keyword overlap
-        if keyword_overlap >= 2:
-            normalized = min(1.0, normalized * 1.1)
-        if keyword_overlap >= 4:
-            normalized = min(1.0, normalized * 1.15)
-        
+        normalized = np.where(keyword_overlap >= 2, np.minimum(1.0, normalized * 1.1), normalized)
+        normalized = np.where(keyword_overlap >= 4, np.minimum(1.0, normalized * 1.15), normalized)
         return normalized
     
     def _clean_text(self, text):
@@ -0,0 +1,94 @@
+import os
+import pickle
+import datetime
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump whenever the vectorizer settings change so stale persisted models are rejected
+TFIDF_MODEL_VERSION = 1
+
+
+def build_vectorizer():
+    """Create the TF-IDF vectorizer used for JD/question scoring."""
+    return TfidfVectorizer(
+        stop_words='english',
+        ngram_range=(1, 3),
+        max_features=5000
+    )
+
+
+class TfidfModel:
+    """
+    TF-IDF stage for relevance scoring.
+
+    Without a background corpus the vectorizer is fitted once per scoring call on
+    the JD plus all questions. When fitted on (or loaded from) a background corpus
+    of JDs the IDF weights are reused as-is, which keeps scores stable across requests.
+    """
+
+    def __init__(self, vectorizer=None, corpus_size=0):
+        self.vectorizer = vectorizer
+        self.corpus_size = corpus_size
+
+    @property
+    def is_background(self):
+        return self.vectorizer is not None
+
+    @classmethod
+    def fit_background(cls, jd_texts):
+        """Fit the IDF weights on a background corpus of job descriptions."""
+        jd_texts = list(jd_texts)
+        vectorizer = build_vectorizer()
+        vectorizer.fit(jd_texts)
+        return cls(vectorizer, corpus_size=len(jd_texts))
+
+    def save(self, path):
+        """Persist a background model together with its version metadata."""
+        if not self.is_background:
+            raise ValueError("Only a model fitted on a background corpus can be saved")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = {
+            'version': TFIDF_MODEL_VERSION,
+            'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'corpus_size': self.corpus_size,
+            'vectorizer': self.vectorizer
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted background model, rejecting incompatible versions."""
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') != TFIDF_MODEL_VERSION:
+            raise ValueError(
+                f"TF-IDF model at {path} has version {payload.get('version')}, "
+                f"expected {TFIDF_MODEL_VERSION}"
+            )
+        return cls(payload['vectorizer'], corpus_size=payload.get('corpus_size', 0))
+
+    def score(self, jd_text, questions):
+        """
+        Calculate TF-IDF cosine similarity of every question against the JD.
+
+        All questions are transformed into one sparse matrix; rows are L2-normalized
+        by the vectorizer so the cosine scores come from a single sparse product.
+        """
+        if not questions:
+            return np.zeros(0, dtype=np.float32)
+        texts = [jd_text] + list(questions)
+        try:
+            if self.is_background:
+                matrix = self.vectorizer.transform(texts)
+            else:
+                matrix = build_vectorizer().fit_transform(texts)
+        except ValueError:
+            # Empty vocabulary, e.g. only stop words in every text
+            return np.zeros(len(questions), dtype=np.float32)
+        scores = matrix[1:] @ matrix[0].T
+        return np.asarray(scores.toarray(), dtype=np.float32).ravel()
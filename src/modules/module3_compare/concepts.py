@@ -0,0 +1,98 @@
+import numpy as np
+
+from src.modules.module3_compare.index import normalize_rows
+
+# Dataset column holding comma-separated topic tags, e.g. "Array,Hash Table"
+CONCEPT_COLUMN = 'related_topics'
+# Default similarity between a question and a concept centroid to count as covered
+CONCEPT_THRESHOLD = 0.5
+
+
+def split_topics(value):
+    """Split a topic tag cell into clean concept names."""
+    if value is None:
+        return []
+    value = str(value)
+    if value.lower() in ('', 'nan', 'none'):
+        return []
+    return [topic.strip() for topic in value.split(',') if topic.strip()]
+
+
+class ConceptCoverage:
+    """
+    DSA concept coverage from precomputed concept centroids.
+
+    Each concept (topic tag) is represented by the normalized mean embedding of
+    the dataset rows tagged with it, so scoring a whole question set is one
+    question x concept matrix product.
+    """
+
+    FILENAME = 'concepts.npz'
+
+    def __init__(self, names, centroids):
+        self.names = [str(name) for name in names]
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_embeddings(cls, embeddings, topics):
+        """
+        Build one centroid per concept.
+
+        Args:
+            embeddings (np.ndarray): Normalized row embeddings
+            topics (list): Topic tag cell of each row
+        """
+        members = {}
+        for row, value in enumerate(topics):
+            for topic in split_topics(value):
+                members.setdefault(topic, []).append(row)
+        names = sorted(members)
+        if not names:
+            return cls([], np.zeros((0, embeddings.shape[1]), dtype=np.float32))
+        centroids = np.stack([
+            np.asarray(embeddings[members[name]], dtype=np.float32).mean(axis=0) for name in names
+        ])
+        return cls(names, normalize_rows(centroids))
+
+    def save(self, path, fingerprint=''):
+        np.savez(path, names=np.asarray(self.names, dtype=str), centroids=self.centroids, fingerprint=fingerprint)
+
+    @classmethod
+    def load(cls, path, fingerprint=''):
+        """Load persisted centroids, or None if they belong to another store version."""
+        with np.load(path, allow_pickle=False) as state:
+            if str(state['fingerprint']) != fingerprint:
+                return None
+            return cls(state['names'].tolist(), state['centroids'])
+
+    def coverage(self, question_embeddings, threshold=CONCEPT_THRESHOLD):
+        """
+        Score a question set against every concept.
+
+        Returns:
+            dict: per-concept max scores, the question that best covers each concept,
+                the binary coverage vector, covered concept names and overall coverage
+        """
+        if not len(self) or not len(question_embeddings):
+            return {
+                'concepts': self.names,
+                'scores': np.zeros(len(self), dtype=np.float32),
+                'best_question': np.full(len(self), -1, dtype=np.int64),
+                'coverage_vector': np.zeros(len(self), dtype=np.float32),
+                'covered': [],
+                'coverage': 0.0
+            }
+        similarities = normalize_rows(question_embeddings) @ self.centroids.T
+        scores = similarities.max(axis=0)
+        covered = scores >= threshold
+        return {
+            'concepts': self.names,
+            'scores': scores,
+            'best_question': similarities.argmax(axis=0),
+            'coverage_vector': covered.astype(np.float32),
+            'covered': [name for name, hit in zip(self.names, covered) if hit],
+            'coverage': float(covered.mean())
+        }
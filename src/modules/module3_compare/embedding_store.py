@@ -0,0 +1,247 @@
+import os
+import json
+import hashlib
+import datetime
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks, so stores are not shared between processes there
+    fcntl = None
+
+# Bump whenever the on-disk layout changes so older stores are regenerated
+STORE_FORMAT_VERSION = 1
+
+# Text embedded for every dataset row
+TEXT_TEMPLATE = "{title} Difficulty: {difficulty}"
+
+SUPPORTED_DTYPES = ('float32', 'float16')
+
+
+def hash_text(text):
+    """Content hash of one rendered dataset row."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Versioned, memory-mapped embedding store for a question dataset.
+
+    Layout of `directory`:
+        manifest.json       format version, dataset hash, model name, template, dtype
+        embeddings.npy      normalized row embeddings (float32 or float16)
+        row_hashes.npy      content hash of each rendered row, for incremental updates
+        <column>.npy        fixed-width string columns used for result metadata
+        store.lock          file lock shared by every process using the store
+
+    Embeddings are opened with mmap_mode='r', so worker processes share the
+    same pages through the OS page cache instead of each holding a copy.
+    Writers hold the lock exclusively and readers hold it shared, so a reader
+    never pairs new embeddings with old metadata columns.
+    """
+
+    MANIFEST = 'manifest.json'
+    EMBEDDINGS = 'embeddings.npy'
+    ROW_HASHES = 'row_hashes.npy'
+    LOCK = 'store.lock'
+
+    def __init__(self, directory, model_name, template=TEXT_TEMPLATE, dtype='float32'):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype '{dtype}'. Choose from {SUPPORTED_DTYPES}")
+        self.directory = directory
+        self.model_name = model_name
+        self.template = template
+        self.dtype = dtype
+        self._local = threading.local()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def lock(self, shared=False):
+        """
+        Hold the store's file lock, exclusive unless `shared`.
+
+        Re-entrant within a thread, so a writer can read the store back while
+        holding it.
+        """
+        if fcntl is None or getattr(self._local, 'held', False):
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(self.LOCK), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._local.held = True
+            try:
+                yield
+            finally:
+                self._local.held = False
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def manifest(self):
+        """Return the stored manifest, or None if the store is missing or unreadable."""
+        try:
+            with open(self.path(self.MANIFEST), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_compatible(self):
+        """Check that stored vectors came from this model, template and dtype, whatever the dataset."""
+        manifest = self.manifest()
+        if manifest is None:
+            return False
+        expected = {
+            'version': STORE_FORMAT_VERSION,
+            'model_name': self.model_name,
+            'template': self.template,
+            'dtype': self.dtype
+        }
+        return all(manifest.get(key) == value for key, value in expected.items())
+
+    def is_current(self, dataset_hash):
+        """Check that the store was built from this dataset, model, template and dtype."""
+        with self.lock(shared=True):
+            if not self.is_compatible():
+                return False
+            manifest = self.manifest()
+            if manifest.get('dataset_hash') != dataset_hash:
+                return False
+            files = [self.EMBEDDINGS] + [f"{name}.npy" for name in manifest.get('columns', [])]
+            return all(os.path.exists(self.path(name)) for name in files)
+
+    def fingerprint(self):
+        """Hash of the current manifest; changes whenever the store is rewritten."""
+        manifest = self.manifest()
+        if manifest is None:
+            return ''
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def render(self, row):
+        """Render the text embedded for one dataset row."""
+        return self.template.format(**row)
+
+    def load(self):
+        """
+        Open the stored embeddings (memory-mapped) and metadata columns.
+
+        Returns:
+            tuple: (embeddings, columns) where columns maps name -> array
+        """
+        # Open mappings keep their pages after a writer replaces the files
+        with self.lock(shared=True):
+            manifest = self.manifest()
+            embeddings = np.load(self.path(self.EMBEDDINGS), mmap_mode='r')
+            columns = {
+                name: np.load(self.path(f"{name}.npy"), mmap_mode='r')
+                for name in manifest.get('columns', [])
+            }
+        return embeddings, columns
+
+    def update(self, texts, columns, dataset_hash, encode, batch_size=512):
+        """
+        Bring the store in line with the current dataset rows, encoding only what changed.
+
+        Rows whose rendered text hash is already stored reuse their vector; added or
+        edited rows are encoded in batches and rows no longer present are dropped.
+        The store is locked exclusively throughout; callers that first checked
+        is_current() should re-check it inside lock() so concurrent processes do
+        not each redo the update.
+
+        Args:
+            texts (list): Rendered text of every current dataset row
+            columns (dict): Metadata columns for the current rows
+            dataset_hash (str): Hash of the dataset file
+            encode (callable): Maps a list of texts to normalized embeddings
+            batch_size (int): Number of rows encoded per call
+
+        Returns:
+            np.ndarray: For each current row, its position in the previous store or -1
+        """
+        with self.lock():
+            return self._update(texts, columns, dataset_hash, encode, batch_size)
+
+    def _update(self, texts, columns, dataset_hash, encode, batch_size):
+        row_hashes = [hash_text(text) for text in texts]
+        old_positions = np.full(len(texts), -1, dtype=np.int64)
+        old_embeddings = None
+        if self.is_compatible() and os.path.exists(self.path(self.ROW_HASHES)):
+            old_hashes = np.load(self.path(self.ROW_HASHES))
+            old_embeddings = np.load(self.path(self.EMBEDDINGS), mmap_mode='r')
+            previous = {row_hash: i for i, row_hash in enumerate(old_hashes.tolist())}
+            old_positions = np.array([previous.get(row_hash, -1) for row_hash in row_hashes], dtype=np.int64)
+
+        reused = old_positions >= 0
+        pending = np.flatnonzero(~reused)
+        encoded = [
+            np.asarray(encode([texts[i] for i in batch]), dtype=self.dtype)
+            for batch in np.array_split(pending, max(1, -(-len(pending) // batch_size)))
+            if len(batch)
+        ]
+        if old_embeddings is not None:
+            dimension = old_embeddings.shape[1]
+        else:
+            dimension = encoded[0].shape[1] if encoded else 0
+
+        embeddings = np.empty((len(texts), dimension), dtype=self.dtype)
+        if reused.any():
+            embeddings[reused] = old_embeddings[old_positions[reused]]
+        if encoded:
+            embeddings[pending] = np.concatenate(encoded)
+
+        removed = 0 if old_embeddings is None else len(old_embeddings) - int(reused.sum())
+        print(f"Embedding store: reused {int(reused.sum())}, encoded {len(pending)}, dropped {removed} rows")
+        self.write(embeddings, columns, dataset_hash, row_hashes=row_hashes)
+        return old_positions
+
+    def write(self, embeddings, columns, dataset_hash, row_hashes=None, extra=None):
+        """
+        Replace the store contents under the exclusive lock.
+
+        Every file is written to a per-process temporary name and moved into
+        place, manifest last; readers wait on the lock until the whole set is
+        replaced.
+        """
+        with self.lock():
+            self._write(embeddings, columns, dataset_hash, row_hashes, extra)
+
+    def _write(self, embeddings, columns, dataset_hash, row_hashes, extra):
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_array(self.EMBEDDINGS, np.asarray(embeddings, dtype=self.dtype))
+        if row_hashes is not None:
+            self._write_array(self.ROW_HASHES, np.asarray(row_hashes, dtype=str))
+        for name, values in columns.items():
+            self._write_array(f"{name}.npy", np.asarray(values, dtype=str))
+        manifest = {
+            'version': STORE_FORMAT_VERSION,
+            'dataset_hash': dataset_hash,
+            'model_name': self.model_name,
+            'template': self.template,
+            'dtype': self.dtype,
+            'count': int(len(embeddings)),
+            'dimension': int(embeddings.shape[1]) if len(embeddings) else 0,
+            'columns': list(columns),
+            'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        manifest.update(extra or {})
+        tmp_path = self.path(f"{self.MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, self.path(self.MANIFEST))
+
+    def _write_array(self, name, array):
+        tmp_path = self.path(f"{name}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, array)
+        os.replace(tmp_path, self.path(name))
@@ -0,0 +1,334 @@
+import json
+import time
+import numpy as np
+
+# Format version of persisted index files
+INDEX_FORMAT_VERSION = 2
+# Rows of a reduced-precision corpus upcast at a time by flat search
+FLAT_BLOCK_ROWS = 65536
+
+
+def normalize_rows(vectors):
+    """Return float32 rows scaled to unit L2 norm (zero rows are left as zeros)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_indices(scores, k):
+    """Indices of the k largest scores along the last axis, sorted descending."""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < scores.shape[-1]:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+class FlatIndex:
+    """
+    Exact inner-product search over normalized embeddings.
+
+    This is the baseline every approximate index is measured against.
+    """
+
+    kind = 'flat'
+    # Parameters that shape the persisted index, and ones only read at query time
+    build_params = ()
+    query_params = ()
+
+    def __init__(self):
+        self.embeddings = None
+
+    def __len__(self):
+        return 0 if self.embeddings is None else len(self.embeddings)
+
+    def build(self, embeddings):
+        self.embeddings = embeddings
+        return self
+
+    def search(self, queries, k):
+        """
+        Return the top-k (scores, ids) for each query, both shaped (n_queries, k).
+        """
+        similarities = self._similarities(queries)
+        ids = top_k_indices(similarities, k)
+        return np.take_along_axis(similarities, ids, axis=1), ids
+
+    def range_search(self, queries, threshold):
+        """Return one (scores, ids) pair per query with every score >= threshold, sorted descending."""
+        similarities = self._similarities(queries)
+        results = []
+        for row in similarities:
+            ids = np.flatnonzero(row >= threshold)
+            order = np.argsort(-row[ids], kind='stable')
+            results.append((row[ids[order]], ids[order]))
+        return results
+
+    def _similarities(self, queries, block_size=FLAT_BLOCK_ROWS):
+        """
+        Scores of every query against every embedding, as float32.
+
+        A float16 store is upcast block by block, so a search never materialises
+        a float32 copy of the whole memory-mapped corpus.
+        """
+        queries = normalize_rows(queries)
+        if self.embeddings.dtype == np.float32:
+            return queries @ self.embeddings.T
+        similarities = np.empty((len(queries), len(self.embeddings)), dtype=np.float32)
+        for start in range(0, len(self.embeddings), block_size):
+            block = np.asarray(self.embeddings[start:start + block_size], dtype=np.float32)
+            similarities[:, start:start + block_size] = queries @ block.T
+        return similarities
+
+    def update(self, embeddings, old_positions):
+        """Point the index at an updated embedding matrix."""
+        self.embeddings = embeddings
+        return self
+
+    def save(self, path, fingerprint=''):
+        np.savez(
+            path,
+            version=INDEX_FORMAT_VERSION,
+            kind=self.kind,
+            count=len(self),
+            fingerprint=fingerprint,
+            params=_params_key(self)
+        )
+
+    def _load_state(self, state, embeddings):
+        self.embeddings = embeddings
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index.
+
+    Embeddings are clustered with spherical k-means into `n_lists` cells; a query
+    only scores the vectors in its `n_probe` closest cells. Raising `n_probe`
+    trades latency for recall.
+    """
+
+    kind = 'ivf'
+    build_params = ('n_lists', 'n_iter', 'max_train', 'seed')
+    query_params = ('n_probe',)
+
+    def __init__(self, n_lists=None, n_probe=8, n_iter=10, max_train=50000, seed=0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.max_train = max_train
+        self.seed = seed
+        self.embeddings = None
+        self.centroids = None
+        self.list_ids = None
+        self.list_offsets = None
+
+    def __len__(self):
+        return 0 if self.embeddings is None else len(self.embeddings)
+
+    def build(self, embeddings):
+        """Train the coarse quantizer and assign every embedding to its cell."""
+        self.embeddings = embeddings
+        n = len(embeddings)
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(n)))
+        n_lists = min(n_lists, n)
+        self.centroids = self._train_centroids(embeddings, n_lists)
+        self._build_lists(self._assign(embeddings))
+        return self
+
+    def update(self, embeddings, old_positions):
+        """
+        Update the index in place for an edited corpus without retraining the cells.
+
+        Rows carried over from the previous corpus (old_positions >= 0) keep their
+        cell; new or changed rows are assigned to their nearest existing centroid.
+        """
+        old_assignments = np.empty(len(self.list_ids), dtype=np.int64)
+        old_assignments[self.list_ids] = np.repeat(np.arange(len(self.centroids)), np.diff(self.list_offsets))
+        old_positions = np.asarray(old_positions, dtype=np.int64)
+        self.embeddings = embeddings
+        assignments = np.empty(len(embeddings), dtype=np.int64)
+        kept = old_positions >= 0
+        assignments[kept] = old_assignments[old_positions[kept]]
+        added = np.flatnonzero(~kept)
+        if len(added):
+            assignments[added] = self._assign(embeddings[added])
+        self._build_lists(assignments)
+        return self
+
+    def search(self, queries, k):
+        """
+        Return the approximate top-k (scores, ids) for each query, both shaped
+        (n_queries, k). Missing slots are filled with id -1 and score -inf.
+        """
+        queries = normalize_rows(queries)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, candidates in enumerate(self._probe(queries)):
+            candidate_scores = self.embeddings[candidates] @ queries[i]
+            top = top_k_indices(candidate_scores, k)
+            scores[i, :len(top)] = candidate_scores[top]
+            ids[i, :len(top)] = candidates[top]
+        return scores, ids
+
+    def range_search(self, queries, threshold):
+        """Return one (scores, ids) pair per query with every score >= threshold, sorted descending."""
+        queries = normalize_rows(queries)
+        results = []
+        for i, candidates in enumerate(self._probe(queries)):
+            candidate_scores = self.embeddings[candidates] @ queries[i]
+            keep = np.flatnonzero(candidate_scores >= threshold)
+            order = keep[np.argsort(-candidate_scores[keep], kind='stable')]
+            results.append((candidate_scores[order], candidates[order]))
+        return results
+
+    def save(self, path, fingerprint=''):
+        np.savez(
+            path,
+            version=INDEX_FORMAT_VERSION,
+            kind=self.kind,
+            count=len(self),
+            fingerprint=fingerprint,
+            params=_params_key(self),
+            centroids=self.centroids,
+            list_ids=self.list_ids,
+            list_offsets=self.list_offsets
+        )
+
+    def _load_state(self, state, embeddings):
+        self.embeddings = embeddings
+        self.centroids = state['centroids']
+        self.list_ids = state['list_ids']
+        self.list_offsets = state['list_offsets']
+
+    def _probe(self, queries):
+        """Yield the candidate ids from the n_probe closest cells of each query."""
+        coarse = queries @ self.centroids.T
+        probes = top_k_indices(coarse, self.n_probe)
+        for lists in probes:
+            yield np.concatenate([
+                self.list_ids[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists
+            ])
+
+    def _assign(self, vectors, chunk_size=8192):
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+            assignments[start:start + chunk_size] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def _train_centroids(self, embeddings, n_lists):
+        rng = np.random.default_rng(self.seed)
+        n = len(embeddings)
+        sample_ids = np.sort(rng.choice(n, min(n, self.max_train), replace=False))
+        sample = np.asarray(embeddings[sample_ids], dtype=np.float32)
+        self.centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignments = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            # Empty cells keep their previous centroid
+            filled = counts > 0
+            self.centroids[filled] = normalize_rows(sums[filled])
+        return self.centroids
+
+    def _build_lists(self, assignments):
+        self.list_ids = np.argsort(assignments, kind='stable').astype(np.int64)
+        counts = np.bincount(assignments, minlength=len(self.centroids))
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+
+def _params_key(index):
+    # The requested build parameters, so a persisted index built with others is not reused
+    return json.dumps({name: getattr(index, name) for name in index.build_params}, sort_keys=True)
+
+
+INDEX_TYPES = {
+    FlatIndex.kind: FlatIndex,
+    IVFIndex.kind: IVFIndex
+}
+
+
+def build_index(kind, embeddings, **params):
+    """Build an index of the given kind ('flat' or 'ivf') over normalized embeddings."""
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{kind}'. Choose from {sorted(INDEX_TYPES)}")
+    return INDEX_TYPES[kind](**params).build(embeddings)
+
+
+def load_index(path, embeddings, fingerprint='', count=None, params=None):
+    """
+    Load a persisted index for the given embeddings.
+
+    `params` are the index parameters the caller would build with. Query-time
+    parameters (e.g. n_probe) are applied to the loaded index.
+
+    Returns None when the file was written by another format version, for another
+    index kind, for a different number of embeddings (`count`, defaulting to
+    len(embeddings)), with a different fingerprint or with different build
+    parameters (e.g. n_lists), so callers rebuild it.
+    """
+    count = len(embeddings) if count is None else count
+    with np.load(path, allow_pickle=False) as state:
+        if int(state['version']) != INDEX_FORMAT_VERSION or int(state['count']) != count:
+            return None
+        if str(state['fingerprint']) != fingerprint:
+            return None
+        kind = str(state['kind'])
+        if kind not in INDEX_TYPES:
+            return None
+        index = INDEX_TYPES[kind](**(params or {}))
+        if str(state['params']) != _params_key(index):
+            return None
+        index._load_state({name: state[name] for name in state.files}, embeddings)
+    return index
+
+
+def benchmark_index(index, queries, k=10, exact_index=None):
+    """
+    Measure recall@k and per-query latency of an index against exact flat search.
+
+    Returns:
+        dict: recall, and mean latency in milliseconds for the index and exact search
+    """
+    if exact_index is None:
+        exact_index = FlatIndex().build(index.embeddings)
+
+    start = time.perf_counter()
+    _, exact_ids = exact_index.search(queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    _, ids = index.search(queries, k)
+    index_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    hits = sum(len(np.intersect1d(found, expected)) for found, expected in zip(ids, exact_ids))
+    return {
+        'kind': index.kind,
+        'k': k,
+        'recall': hits / exact_ids.size if exact_ids.size else 1.0,
+        'latency_ms': index_ms,
+        'exact_latency_ms': exact_ms
+    }
+
+
+if __name__ == "__main__":
+    # Synthetic recall-vs-latency sweep over n_probe
+    rng = np.random.default_rng(0)
+    corpus = normalize_rows(rng.standard_normal((100000, 384)))
+    queries = normalize_rows(corpus[:200] + 0.1 * rng.standard_normal((200, 384)))
+    exact = FlatIndex().build(corpus)
+    ivf = IVFIndex().build(corpus)
+    for n_probe in (1, 4, 8, 16, 32):
+        ivf.n_probe = n_probe
+        result = benchmark_index(ivf, queries, k=10, exact_index=exact)
+        print(f"n_probe={n_probe:>3}  recall@10={result['recall']:.3f}  "
+              f"ivf={result['latency_ms']:.2f}ms  flat={result['exact_latency_ms']:.2f}ms")
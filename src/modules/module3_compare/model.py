@@ -1,59 +1,124 @@
-import pandas as pd
 import numpy as np
 import os
-import pickle
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 import nltk
 from nltk.tokenize import word_tokenize
 
+from src.modules.encoder_registry import get_encoder
+from src.modules.module3_compare.shards import CorpusShard, ShardedCorpus
+from src.modules.module3_compare.concepts import CONCEPT_THRESHOLD
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Default similarity for a dataset question to count as a strong match
+MATCH_THRESHOLD = 0.7
+# Default cap on matched sources returned per question
+MAX_MATCHES = 10
+
 class QuestionSimilarityModel:
-    def __init__(self, dataset_path, cache_path='embeddings_cache.pkl'):
-        self.dataset_path = dataset_path
-        self.cache_path = cache_path
-        self.dataset = pd.read_csv(dataset_path)
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.embeddings = self._load_or_generate_embeddings()
-
-    def _generate_embeddings(self, questions):
-        combined_text = questions.apply(lambda x: f"{x['title']} Difficulty: {x['difficulty']}", axis=1)
-        return self.model.encode(combined_text.tolist(), convert_to_tensor=True)
-
-    def _load_or_generate_embeddings(self):
-        if os.path.exists(self.cache_path):
-            with open(self.cache_path, 'rb') as f:
-                print("Loading cached embeddings...")
-                return pickle.load(f)
+    def __init__(self, dataset_path, cache_dir='embeddings_cache', index_type='flat', index_params=None,
+                 top_k=MAX_MATCHES, threshold=MATCH_THRESHOLD, dtype='float32', max_workers=None):
+        """
+        Args:
+            dataset_path (str | dict): One dataset CSV, or a mapping of source name to
+                CSV path. Every source becomes a lazily loaded shard with its own
+                embeddings and index under cache_dir/<source name>.
+        """
+        if isinstance(dataset_path, dict):
+            sources = dict(dataset_path)
         else:
-            print("Generating new embeddings...")
-            embeddings = self._generate_embeddings(self.dataset)
-            with open(self.cache_path, 'wb') as f:
-                pickle.dump(embeddings, f)
-            return embeddings
+            sources = {os.path.splitext(os.path.basename(dataset_path))[0]: dataset_path}
+        self.dataset_path = dataset_path
+        self.cache_dir = cache_dir
+        self.top_k = top_k
+        self.threshold = threshold
+        self.encoder = get_encoder(MODEL_NAME)
+        self.model = self.encoder.model
+        self.corpus = ShardedCorpus([
+            CorpusShard(name, path, os.path.join(cache_dir, name), self.encoder,
+                        index_type=index_type, index_params=index_params, dtype=dtype)
+            for name, path in sources.items()
+        ], max_workers=max_workers)
+
+    def concept_coverage(self, new_questions, threshold=CONCEPT_THRESHOLD):
+        """Score which DSA concepts a question set covers, using the concept centroids of every source."""
+        query_embeddings = self.encoder.encode(self.embedding_texts(new_questions))
+        concept_scores = {}
+        for concepts in self.corpus.concepts():
+            coverage = concepts.coverage(query_embeddings, threshold=threshold)
+            for name, score in zip(coverage['concepts'], coverage['scores']):
+                concept_scores[name] = max(concept_scores.get(name, -1.0), float(score))
+        names = sorted(concept_scores)
+        scores = np.array([concept_scores[name] for name in names], dtype=np.float32)
+        covered = scores >= threshold
+        return {
+            'concepts': names,
+            'scores': scores,
+            'coverage_vector': covered.astype(np.float32),
+            'covered': [name for name, hit in zip(names, covered) if hit],
+            'coverage': float(covered.mean()) if len(names) else 0.0
+        }
+
+    def stats(self):
+        """Per-source shard statistics."""
+        return self.corpus.stats()
+
+    def embedding_texts(self, questions):
+        """The preprocessed question texts that are embedded for matching."""
+        return [self._preprocess(q) for q in questions]
 
     def _preprocess(self, text):
         tokens = word_tokenize(text.lower())
         return ' '.join(tokens)
 
-    def check_similarity(self, new_questions):
+    def check_similarity(self, new_questions, top_k=None, threshold=None):
+        """
+        Match a batch of questions against the dataset.
+
+        All questions are encoded in one call and searched together; each result
+        carries at most `top_k` matched sources scoring at or above `threshold`.
+        """
+        top_k = self.top_k if top_k is None else top_k
+        threshold = self.threshold if threshold is None else threshold
+        new_questions = list(new_questions)
+        if not new_questions:
+            return []
+
+        query_embeddings = self.encoder.encode(self.embedding_texts(new_questions))
+        scores, shard_ids, ids = self.corpus.search(query_embeddings, max(top_k, 1), threshold)
+        # An IVF query whose probed cells are all empty finds nothing; scan those queries exactly
+        missing = np.flatnonzero(ids[:, 0] < 0) if ids.shape[1] else np.zeros(0, dtype=np.int64)
+        if len(missing):
+            exact_scores, exact_shards, exact_ids = self.corpus.search(
+                query_embeddings[missing], max(top_k, 1), threshold, exact=True
+            )
+            # Flat search returns at most one column per corpus row; the rest stay empty
+            width = exact_ids.shape[1]
+            scores[missing, :width] = exact_scores
+            shard_ids[missing, :width] = exact_shards
+            ids[missing, :width] = exact_ids
+
+        shards = self.corpus.shards
         results = []
-        for question in new_questions:
-            preprocessed = self._preprocess(question)
-            new_embedding = self.model.encode(preprocessed, convert_to_tensor=True)
-            similarities = cosine_similarity([new_embedding], self.embeddings)[0]
-            max_score = np.max(similarities)
-            max_index = np.argmax(similarities)
-            matched_indices = np.where(similarities >= 0.7)[0]  # Threshold for strong match
-            matched_sources = self.dataset.iloc[matched_indices][['title', 'difficulty']].to_dict('records')
-            best_match = self.dataset.iloc[max_index]
+        for question, question_scores, question_shards, question_ids in zip(new_questions, scores, shard_ids, ids):
+            strong = (question_ids >= 0) & (question_scores >= threshold)  # Threshold for strong match
+            matched = list(zip(question_shards[strong], question_ids[strong]))[:top_k]
+            found = len(question_ids) and question_ids[0] >= 0
+            best_match = None
+            if found:
+                best_shard = shards[int(question_shards[0])]
+                max_index = int(question_ids[0])
+                best_match = {
+                    'index': max_index,
+                    'source': best_shard.name,
+                    **best_shard.metadata(max_index)
+                }
             results.append({
                 'input_question': question,
-                'relevance_score': float(max_score),
-                'matched_sources': matched_sources,
-                'best_match': {
-                    'index': int(max_index),
-                    'title': best_match['title'],
-                    'difficulty': best_match['difficulty']
-                }
+                # An empty corpus has no best match; it scores 0 rather than -inf
+                'relevance_score': float(question_scores[0]) if found else 0.0,
+                'matched_sources': [
+                    {**shards[shard].metadata(row), 'source': shards[shard].name} for shard, row in matched
+                ],
+                'best_match': best_match
             })
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,233 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.modules.module3_compare.index import FlatIndex, build_index, load_index, top_k_indices
+from src.modules.module3_compare.embedding_store import EmbeddingStore, TEXT_TEMPLATE, hash_file
+from src.modules.module3_compare.concepts import ConceptCoverage, CONCEPT_COLUMN
+
+# Dataset columns kept alongside the embeddings for result metadata
+METADATA_COLUMNS = ('title', 'difficulty')
+# Stored as well when the dataset has them
+OPTIONAL_COLUMNS = (CONCEPT_COLUMN,)
+
+
+class CorpusShard:
+    """
+    One question corpus (a CSV) with its own memory-mapped embeddings and index.
+
+    Nothing is read until the shard is first searched, so a worker only pays for
+    the corpora it actually queries.
+    """
+
+    def __init__(self, name, dataset_path, cache_dir, encoder, index_type='flat', index_params=None,
+                 dtype='float32'):
+        self.name = name
+        self.dataset_path = dataset_path
+        self.cache_dir = cache_dir
+        self.encoder = encoder
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.store = EmbeddingStore(cache_dir, encoder.model_name, template=TEXT_TEMPLATE, dtype=dtype)
+        self.embeddings = None
+        self.columns = None
+        self.index = None
+        self._concepts = None
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.hits = 0
+        self.load_seconds = 0.0
+        self.search_seconds = 0.0
+
+    @property
+    def loaded(self):
+        return self.index is not None
+
+    def ensure_loaded(self):
+        """Load embeddings, metadata and index on first use."""
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            start = time.perf_counter()
+            self.dataset_hash = hash_file(self.dataset_path)
+            # Other processes (e.g. batch workers) may be loading the same cache
+            with self.store.lock():
+                self.embeddings, self.columns, previous = self._load_or_generate_embeddings()
+                self.index = self._load_or_build_index(previous)
+            self.load_seconds = time.perf_counter() - start
+
+    def search(self, query_embeddings, k, threshold, exact=False):
+        """
+        Top-k (scores, ids) for each query; hits scoring >= threshold are counted in the stats.
+
+        `exact` bypasses an approximate index with a flat scan of the embeddings.
+        """
+        self.ensure_loaded()
+        start = time.perf_counter()
+        index = FlatIndex().build(self.embeddings) if exact and self.index.kind != FlatIndex.kind else self.index
+        scores, ids = index.search(query_embeddings, k)
+        with self._lock:
+            self.queries += len(query_embeddings)
+            self.hits += int(((ids >= 0) & (scores >= threshold)).sum())
+            self.search_seconds += time.perf_counter() - start
+        return scores, ids
+
+    def metadata(self, row):
+        """Result metadata for one row of this shard."""
+        return {
+            'title': str(self.columns['title'][row]),
+            'difficulty': str(self.columns['difficulty'][row])
+        }
+
+    def concepts(self):
+        """Concept centroids of this shard, built and persisted on first use."""
+        self.ensure_loaded()
+        with self._lock:
+            if self._concepts is None:
+                with self.store.lock():
+                    self._concepts = self._load_or_build_concepts()
+            return self._concepts
+
+    def stats(self):
+        return {
+            'loaded': self.loaded,
+            'rows': 0 if self.embeddings is None else len(self.embeddings),
+            'queries': self.queries,
+            'hits': self.hits,
+            'load_seconds': self.load_seconds,
+            'search_seconds': self.search_seconds
+        }
+
+    def _generate_embeddings(self, texts):
+        return self.encoder.encode(texts, use_cache=False)
+
+    def _load_or_generate_embeddings(self):
+        """
+        Open the embedding store, updating it first if the dataset changed.
+
+        Returns:
+            tuple: (embeddings, columns, previous) where previous is None for a
+                cache hit, else (fingerprint, row count, old row positions) of the
+                store before the update
+        """
+        if self.store.is_current(self.dataset_hash):
+            print(f"Loading cached embeddings for '{self.name}'...")
+            return (*self.store.load(), None)
+
+        # Only rows that were added or edited are re-encoded
+        print(f"Updating embeddings for '{self.name}'...")
+        manifest = self.store.manifest() or {}
+        previous_fingerprint = self.store.fingerprint()
+        dataset = pd.read_csv(self.dataset_path)
+        texts = [self.store.render(row) for row in dataset.to_dict('records')]
+        columns = {
+            name: dataset[name].astype(str).tolist()
+            for name in METADATA_COLUMNS + OPTIONAL_COLUMNS if name in dataset.columns
+        }
+        old_positions = self.store.update(texts, columns, self.dataset_hash, self._generate_embeddings)
+        previous = (previous_fingerprint, manifest.get('count', 0), old_positions)
+        return (*self.store.load(), previous)
+
+    def _index_path(self):
+        # Persisted next to the embeddings, one file per index type
+        return self.store.path(f"{self.index_type}.index.npz")
+
+    def _load_or_build_index(self, previous=None):
+        index_path = self._index_path()
+        if os.path.exists(index_path) and previous is None:
+            index = load_index(
+                index_path, self.embeddings, fingerprint=self.store.fingerprint(), params=self.index_params
+            )
+            if index is not None and index.kind == self.index_type:
+                print(f"Loading cached search index for '{self.name}'...")
+                return index
+        elif os.path.exists(index_path) and (previous[2] >= 0).any():
+            # Carry the previous index over to the updated corpus
+            previous_fingerprint, previous_count, old_positions = previous
+            index = load_index(
+                index_path, self.embeddings, fingerprint=previous_fingerprint, count=previous_count,
+                params=self.index_params
+            )
+            if index is not None and index.kind == self.index_type:
+                print(f"Updating {self.index_type} search index for '{self.name}'...")
+                index.update(self.embeddings, old_positions)
+                index.save(index_path, fingerprint=self.store.fingerprint())
+                return index
+        print(f"Building {self.index_type} search index for '{self.name}'...")
+        index = build_index(self.index_type, self.embeddings, **self.index_params)
+        index.save(index_path, fingerprint=self.store.fingerprint())
+        return index
+
+    def _load_or_build_concepts(self):
+        # Concept centroids are stored with the embeddings and rebuilt when they change
+        concepts_path = self.store.path(ConceptCoverage.FILENAME)
+        fingerprint = self.store.fingerprint()
+        if os.path.exists(concepts_path):
+            concepts = ConceptCoverage.load(concepts_path, fingerprint=fingerprint)
+            if concepts is not None:
+                return concepts
+        if CONCEPT_COLUMN in self.columns:
+            topics = self.columns[CONCEPT_COLUMN]
+        else:
+            # Stores written before topics were kept: read the tags from the CSV
+            dataset = pd.read_csv(self.dataset_path)
+            topics = dataset[CONCEPT_COLUMN].tolist() if CONCEPT_COLUMN in dataset.columns else []
+        print(f"Building DSA concept centroids for '{self.name}'...")
+        concepts = ConceptCoverage.from_embeddings(self.embeddings, topics)
+        concepts.save(concepts_path, fingerprint=fingerprint)
+        return concepts
+
+
+class ShardedCorpus:
+    """
+    Fan-out search over several corpus shards.
+
+    Each query batch is sent to every shard on a thread pool (the matrix products
+    release the GIL) and the per-shard top-k lists are merged into a global top-k.
+    """
+
+    def __init__(self, shards, max_workers=None):
+        self.shards = list(shards)
+        self.max_workers = max_workers or len(self.shards)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def search(self, query_embeddings, k, threshold, exact=False):
+        """
+        Return merged top-k results for each query; `exact` makes every shard scan flat.
+
+        Returns:
+            tuple: (scores, shard_ids, row_ids), each shaped (n_queries, k); shard_ids
+                index into self.shards and empty slots have row id -1
+        """
+        per_shard = list(self._executor.map(
+            lambda shard: shard.search(query_embeddings, k, threshold, exact=exact), self.shards
+        ))
+        if len(per_shard) == 1:
+            scores, ids = per_shard[0]
+            return scores, np.zeros_like(ids), ids
+        scores = np.concatenate([result[0] for result in per_shard], axis=1)
+        ids = np.concatenate([result[1] for result in per_shard], axis=1)
+        shard_ids = np.concatenate([
+            np.full(result[1].shape, i, dtype=np.int64) for i, result in enumerate(per_shard)
+        ], axis=1)
+        scores = np.where(ids >= 0, scores, -np.inf)
+        top = top_k_indices(scores, k)
+        return (
+            np.take_along_axis(scores, top, axis=1),
+            np.take_along_axis(shard_ids, top, axis=1),
+            np.take_along_axis(ids, top, axis=1)
+        )
+
+    def concepts(self):
+        """Concept centroids of every shard, in shard order."""
+        return list(self._executor.map(lambda shard: shard.concepts(), self.shards))
+
+    def stats(self):
+        """Per-shard load, query and hit statistics."""
+        return {shard.name: shard.stats() for shard in self.shards}
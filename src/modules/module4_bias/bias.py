@@ -1,8 +1,17 @@
 import spacy
 from textblob import TextBlob
 
+from src.modules.module4_bias.lexicon import BiasLexicon
+from src.modules.module4_bias.semantic import SemanticBiasDetector
+
 nlp = spacy.load('en_core_web_sm')
 
+# Sentiment polarity below this marks a question as offensive
+OFFENSIVE_POLARITY_THRESHOLD = -0.5
+
+# Selectable bias detectors: exact lexicon matching or word-vector similarity
+BIAS_DETECTORS = ('lexicon', 'semantic')
+
 # Define comprehensive biased terms/phrases
 biased_terms = [
     "motherhood", "fatherhood", "stay-at-home parent", "single parent", "working mom", "working dad",
@@ -40,34 +49,87 @@ biased_terms = [
     "ugly", "unattractive", "plain", "homely", "unsightly"
 ]
 
+# Compiled once; screening only needs the tokenizer, not the full pipeline
+bias_lexicon = BiasLexicon(biased_terms, nlp.tokenizer)
+
+def find_biased_spans(question):
+    """Return the BiasMatch spans of lexicon terms found in the question."""
+    return bias_lexicon.match_text(question)
+
 def screen_for_bias(question):
-    doc = nlp(question)
-    for token in doc:
-        if token.text.lower() in biased_terms:
-            return False  # Question is biased
+    if find_biased_spans(question):
+        return False  # Question is biased
     return True # Question is unbiased
 
 def screen_for_offensive_language(question):
     sentiment = TextBlob(question).sentiment
-    if sentiment.polarity < -0.5:  # Threshold for negative sentiment
+    if sentiment.polarity < OFFENSIVE_POLARITY_THRESHOLD:
         return False  # Question is offensive
     return True  # Question is not offensive
 
-def screen_questions(questions):
+_semantic_detector = None
+
+def get_semantic_detector():
+    """Load the word-vector bias detector on first use (en_core_web_md is large)."""
+    global _semantic_detector
+    if _semantic_detector is None:
+        _semantic_detector = SemanticBiasDetector(biased_terms)
+    return _semantic_detector
+
+def screen_batch(questions, batch_size=256, detector='lexicon', threshold=None, docs=None):
+    """
+    Screens questions in bulk for bias and offensive language.
+    With the 'lexicon' detector questions are streamed through nlp.pipe with
+    every pipeline component disabled, since the matcher only reads tokenizer
+    output. The 'semantic' detector flags tokens whose word vector is within
+    `threshold` cosine similarity of a biased term.
+    `docs` may carry Docs for the questions that were already produced by an
+    en_core_web_sm pipeline; the lexicon detector then skips tokenization.
+    Returns one result dict per question, in input order.
+    """
+    questions = list(questions)
+    if detector == 'lexicon':
+        if docs is None:
+            docs = nlp.pipe(questions, batch_size=batch_size, disable=nlp.pipe_names)
+        flagged = [[match.text for match in bias_lexicon.match(doc)] for doc in docs]
+        similarities = [None] * len(questions)
+    elif detector == 'semantic':
+        hits = get_semantic_detector().scan(questions, threshold=threshold, batch_size=batch_size)
+        flagged = [[hit['token']] if hit['biased'] else [] for hit in hits]
+        similarities = [hit['max_similarity'] for hit in hits]
+    else:
+        raise ValueError(f"Unknown bias detector '{detector}'. Choose from {BIAS_DETECTORS}")
+
+    results = []
+    for question, terms, similarity in zip(questions, flagged, similarities):
+        polarity = TextBlob(question).sentiment.polarity
+        result = {
+            'question': question,
+            'valid': not terms and polarity >= OFFENSIVE_POLARITY_THRESHOLD,
+            'biased_terms': terms,
+            'polarity': polarity
+        }
+        if similarity is not None:
+            result['bias_similarity'] = similarity
+        results.append(result)
+    return results
+
+def screen_questions(questions, detector='lexicon', threshold=None):
     """
     Screens a list of questions for bias and offensive language.
-    Returns a tuple: (valid_questions, invalid_questions, accuracy)
-    where accuracy is the ratio of valid questions to total questions.
+    Returns a tuple: (valid_questions, invalid_questions, accuracy, validity)
+    where accuracy is the ratio of valid questions to total questions
+    and validity flags each question (0 valid, 1 invalid).
     """
     valid_questions = []
     invalid_questions = []
     validity = []
-    for question in questions:
-        if screen_for_bias(question) and screen_for_offensive_language(question):
-            valid_questions.append(question)
+    for result in screen_batch(questions, detector=detector, threshold=threshold):
+        if result['valid']:
+            valid_questions.append(result['question'])
             validity.append(0)
         else:
-            invalid_questions.append(question)
+            invalid_questions.append(result['question'])
             validity.append(1)
     
     accuracy = len(valid_questions) / len(questions) if questions else 0
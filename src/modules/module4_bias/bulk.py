@@ -0,0 +1,167 @@
+import os
+import csv
+import json
+import time
+import argparse
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+def iter_questions(path, column='question'):
+    """
+    Stream question strings from a JSONL or CSV file.
+
+    JSONL lines may be plain strings or objects with a `column` field; CSV files
+    must have a `column` header.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if extension in ('.jsonl', '.json'):
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                yield record if isinstance(record, str) else str(record[column])
+        elif extension == '.csv':
+            for row in csv.DictReader(f):
+                yield row[column]
+        else:
+            raise ValueError(f"Unsupported question file type '{extension}'. Use .jsonl or .csv")
+
+
+def iter_batches(items, batch_size):
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _screen_batch(questions, detector='lexicon', threshold=None):
+    # Imported inside the worker so each process loads spaCy once
+    from src.modules.module4_bias.bias import screen_batch
+    return screen_batch(questions, detector=detector, threshold=threshold)
+
+
+def _load_checkpoint(checkpoint_path, input_path):
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path, 'r') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('input') != os.path.abspath(input_path):
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to another input file: {checkpoint.get('input')}")
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint_path, checkpoint):
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def screen_file(input_path, output_path, workers=None, batch_size=256, column='question', checkpoint_path=None,
+                detector='lexicon', threshold=None, overwrite=False):
+    """
+    Bias-screen a large question file and write one JSON result per line.
+
+    Batches are screened on a process pool and written in input order as they
+    complete. After every batch the checkpoint records how many questions and
+    output bytes are done; rerunning with the same checkpoint truncates any
+    partial output and resumes from there. A non-empty output without a
+    checkpoint is only replaced when `overwrite` is set, which also discards
+    any checkpoint and starts over.
+
+    Returns:
+        dict: processed/invalid counts, accuracy and throughput of this run
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    checkpoint = None if overwrite else _load_checkpoint(checkpoint_path, input_path)
+    output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    if checkpoint is None:
+        if output_bytes and not overwrite:
+            raise FileExistsError(
+                f"{output_path} already has results but no checkpoint at {checkpoint_path}; pass overwrite=True "
+                "(--overwrite) to replace it"
+            )
+        checkpoint = {
+            'input': os.path.abspath(input_path),
+            'processed': 0,
+            'invalid': 0,
+            'output_bytes': 0
+        }
+    elif output_bytes < checkpoint['output_bytes']:
+        raise ValueError(
+            f"{output_path} has {output_bytes} bytes but checkpoint {checkpoint_path} records "
+            f"{checkpoint['output_bytes']}; the output does not belong to this checkpoint"
+        )
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    processed_before = checkpoint['processed']
+    screen = partial(_screen_batch, detector=detector, threshold=threshold)
+
+    with open(output_path, 'ab') as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(checkpoint['output_bytes'])
+        out.seek(checkpoint['output_bytes'])
+
+        questions = islice(iter_questions(input_path, column=column), checkpoint['processed'], None)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            def drain(limit):
+                while len(pending) > limit:
+                    results = pending.popleft().result()
+                    for result in results:
+                        out.write((json.dumps(result) + '\n').encode('utf-8'))
+                    out.flush()
+                    checkpoint['processed'] += len(results)
+                    checkpoint['invalid'] += sum(1 for result in results if not result['valid'])
+                    checkpoint['output_bytes'] = out.tell()
+                    _save_checkpoint(checkpoint_path, checkpoint)
+
+            for batch in iter_batches(questions, batch_size):
+                pending.append(executor.submit(screen, batch))
+                # Bound the number of batches held in memory
+                drain(workers * 2)
+            drain(0)
+
+    elapsed = time.perf_counter() - start
+    processed = checkpoint['processed']
+    return {
+        'processed': processed,
+        'invalid': checkpoint['invalid'],
+        'accuracy': (processed - checkpoint['invalid']) / processed if processed else 0,
+        'seconds': elapsed,
+        'questions_per_second': (processed - processed_before) / elapsed if elapsed else 0.0
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk bias screening of a JSONL/CSV question file")
+    parser.add_argument("input", help="Questions file (.jsonl or .csv)")
+    parser.add_argument("output", help="JSONL file receiving one result per question")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--column", default="question", help="Question field/column name")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint path (default: <output>.checkpoint)")
+    parser.add_argument("--detector", choices=("lexicon", "semantic"), default="lexicon")
+    parser.add_argument("--threshold", type=float, default=None, help="Similarity threshold for the semantic detector")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing output and ignore any checkpoint")
+    args = parser.parse_args()
+
+    summary = screen_file(
+        args.input, args.output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        column=args.column,
+        checkpoint_path=args.checkpoint,
+        detector=args.detector,
+        threshold=args.threshold,
+        overwrite=args.overwrite
+    )
+    print(f"Screened {summary['processed']} questions, {summary['invalid']} invalid "
+          f"(accuracy {summary['accuracy'] * 100:.1f}%) at {summary['questions_per_second']:.1f} questions/s")
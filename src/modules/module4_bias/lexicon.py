@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+# One lexicon hit: token span [start, end) in the doc, its text and the lexicon term it matched
+BiasMatch = namedtuple('BiasMatch', ['start', 'end', 'text', 'term'])
+
+# Trie key marking the end of a multi-word term
+_TERM_END = object()
+
+
+class BiasLexicon:
+    """
+    Compiled matcher for a list of biased terms.
+
+    Terms are tokenized with the same tokenizer as the questions and lowercased,
+    so hyphenated and mixed-case entries ("stay-at-home parent", "LGBT") match.
+    Single-token terms live in a hash set and multi-word terms in a token trie;
+    a scan is linear in the number of tokens and prefers the longest match.
+    """
+
+    def __init__(self, terms, tokenizer):
+        self.tokenizer = tokenizer
+        self.single_terms = {}
+        self.trie = {}
+        for term in terms:
+            tokens = [token.lower_ for token in tokenizer(term)]
+            if not tokens:
+                continue
+            if len(tokens) == 1:
+                self.single_terms.setdefault(tokens[0], term)
+                continue
+            node = self.trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_TERM_END, term)
+
+    def match(self, doc):
+        """
+        Find lexicon terms in a tokenized doc.
+
+        Args:
+            doc: spaCy Doc, typically from nlp.tokenizer(question)
+
+        Returns:
+            list: Non-overlapping BiasMatch spans, left to right
+        """
+        tokens = [token.lower_ for token in doc]
+        matches = []
+        i = 0
+        while i < len(tokens):
+            end, term = self._longest_match(tokens, i)
+            if term is None:
+                i += 1
+                continue
+            matches.append(BiasMatch(i, end, doc[i:end].text, term))
+            i = end
+        return matches
+
+    def match_text(self, text):
+        """Tokenize text with the lexicon's tokenizer and find lexicon terms."""
+        return self.match(self.tokenizer(text))
+
+    def _longest_match(self, tokens, start):
+        end, term = start, None
+        if tokens[start] in self.single_terms:
+            end, term = start + 1, self.single_terms[tokens[start]]
+        node = self.trie
+        for i in range(start, len(tokens)):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if _TERM_END in node and i + 1 > end:
+                end, term = i + 1, node[_TERM_END]
+        return end, term
@@ -0,0 +1,82 @@
+import numpy as np
+
+from src.modules.module4_bias.bulk import iter_batches
+
+# spaCy model with static word vectors
+SEMANTIC_MODEL = 'en_core_web_md'
+# Cosine similarity between a token and a bias term that flags a question
+SEMANTIC_THRESHOLD = 0.85
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class SemanticBiasDetector:
+    """
+    Embedding-similarity bias detector.
+
+    Every bias term is turned into a normalized vector once (the mean of its token
+    vectors, like spaCy's Doc.vector). Screening stacks the token vectors of a
+    whole batch of questions and scores them against all terms with a single
+    matrix product; the per-question maximum and its argmax give the score and
+    the token/term responsible.
+    """
+
+    def __init__(self, terms, nlp=None, threshold=SEMANTIC_THRESHOLD):
+        if nlp is None:
+            import spacy
+            nlp = spacy.load(SEMANTIC_MODEL)
+        self.nlp = nlp
+        self.threshold = threshold
+        self.terms = []
+        vectors = []
+        for term in terms:
+            term_vectors = [token.vector for token in nlp.make_doc(term) if token.has_vector]
+            if term_vectors:
+                self.terms.append(term)
+                vectors.append(np.mean(term_vectors, axis=0))
+        width = nlp.vocab.vectors_length
+        self.term_matrix = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, width))
+
+    def scan(self, questions, threshold=None, batch_size=256):
+        """
+        Score questions against the bias terms.
+
+        Returns:
+            list: One dict per question with the max similarity, the matching token
+                and term, and whether it reaches the threshold
+        """
+        threshold = self.threshold if threshold is None else threshold
+        empty = {'max_similarity': 0.0, 'token': None, 'term': None, 'biased': False}
+        results = []
+        # Static vectors come from the vocab, so only the tokenizer has to run
+        docs = self.nlp.pipe(questions, batch_size=batch_size, disable=self.nlp.pipe_names)
+        for batch in iter_batches(docs, batch_size):
+            token_lists = [[token for token in doc if token.has_vector] for doc in batch]
+            vectors = [token.vector for tokens in token_lists for token in tokens]
+            if not vectors or not len(self.terms):
+                results.extend(dict(empty) for _ in batch)
+                continue
+            # One product for every token in the batch against every term
+            similarities = _normalize(np.stack(vectors).astype(np.float32)) @ self.term_matrix.T
+            best_terms = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(best_terms)), best_terms]
+            offset = 0
+            for tokens in token_lists:
+                if not tokens:
+                    results.append(dict(empty))
+                    continue
+                scores = best_scores[offset:offset + len(tokens)]
+                token_index = int(np.argmax(scores))
+                max_similarity = float(scores[token_index])
+                results.append({
+                    'max_similarity': max_similarity,
+                    'token': tokens[token_index].text,
+                    'term': self.terms[best_terms[offset + token_index]],
+                    'biased': max_similarity >= threshold
+                })
+                offset += len(tokens)
+        return results
@@ -0,0 +1,138 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.modules.encoder_registry import get_encoder
+
+# Validators the orchestrator can run on one question set
+VALIDATORS = ('relevance', 'dsa', 'bias')
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+class ValidationOrchestrator:
+    """
+    Runs the relevance, DSA-overlap and bias validators on one question set at once.
+
+    Encoding and parsing are done up front, in the calling thread: the
+    relevance and DSA validators preprocess questions differently, so each
+    embeds its own text, but both sets are encoded in one batched call into
+    the shared encoder cache (texts that happen to match are encoded once).
+    The questions are parsed once with spaCy, and that parse is shared by the
+    relevance entity/context scores and the bias lexicon. The validators then
+    run concurrently on a thread pool (they share the models loaded in this
+    process), so the wall time tracks the slowest validator. Results a caller
+    already has can be passed in and are not computed again.
+    """
+
+    def __init__(self, analyzer=None, similarity_model=None, max_workers=len(VALIDATORS)):
+        """
+        Args:
+            analyzer (EnhancedRelevanceAnalyzer): Needed for 'relevance'; also supplies the shared spaCy parse
+            similarity_model (QuestionSimilarityModel): Needed for 'dsa'
+        """
+        self.analyzer = analyzer
+        self.similarity_model = similarity_model
+        model = analyzer or similarity_model
+        self.encoder = model.encoder if model is not None else get_encoder()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def run(self, questions, jd_text=None, validators=VALIDATORS, precomputed=None):
+        """
+        Validate a question set with the selected validators.
+
+        Args:
+            precomputed (dict): Results already available, by validator name, in the
+                format that validator returns; those validators are not run again
+
+        Returns:
+            dict: Per-validator raw results, a merged row per question, summary
+                scores, per-stage timings in seconds and any validator errors
+        """
+        start = time.perf_counter()
+        questions = list(questions)
+        validators = list(validators)
+        precomputed = precomputed or {}
+        unknown = (set(validators) | set(precomputed)) - set(VALIDATORS)
+        if unknown:
+            raise ValueError(f"Unknown validators {sorted(unknown)}. Choose from {VALIDATORS}")
+        for name, result in precomputed.items():
+            if len(result) != len(questions):
+                raise ValueError(f"Precomputed '{name}' results cover {len(result)} of {len(questions)} questions")
+        results = {name: list(precomputed[name]) for name in validators if name in precomputed}
+        validators = [name for name in validators if name not in results]
+        if 'relevance' in validators and (self.analyzer is None or jd_text is None):
+            raise ValueError("The relevance validator needs an analyzer and a job description")
+        if 'dsa' in validators and self.similarity_model is None:
+            raise ValueError("The dsa validator needs a similarity model")
+
+        timings = {}
+        shared_start = time.perf_counter()
+        texts = []
+        if 'relevance' in validators:
+            texts += self.analyzer.embedding_texts(questions)
+        if 'dsa' in validators:
+            texts += self.similarity_model.embedding_texts(questions)
+        if texts:
+            self.encoder.encode(texts)
+        docs = None
+        if self.analyzer is not None and self.analyzer.nlp and {'relevance', 'bias'} & set(validators):
+            docs = self.analyzer.parse(questions)
+        timings['shared'] = time.perf_counter() - shared_start
+
+        tasks = {}
+        if 'relevance' in validators:
+            tasks['relevance'] = lambda: self.analyzer.calculate_question_scores(jd_text, questions, docs=docs)
+        if 'dsa' in validators:
+            tasks['dsa'] = lambda: self.similarity_model.check_similarity(questions)
+        if 'bias' in validators:
+            from src.modules.module4_bias.bias import screen_batch
+            tasks['bias'] = lambda: screen_batch(questions, docs=docs)
+
+        futures = {name: self.executor.submit(_timed, task) for name, task in tasks.items()}
+        errors = {}
+        for name, future in futures.items():
+            try:
+                results[name], timings[name] = future.result()
+            except Exception as e:
+                print(f"Validator '{name}' failed: {e}")
+                errors[name] = str(e)
+        timings['total'] = time.perf_counter() - start
+
+        return {
+            'questions': questions,
+            'validators': results,
+            'per_question': self._merge(questions, results),
+            'summary': self._summarize(results),
+            'timings': timings,
+            'errors': errors
+        }
+
+    def _merge(self, questions, results):
+        rows = []
+        for i, question in enumerate(questions):
+            row = {'question': question}
+            if 'relevance' in results:
+                row['relevance'] = results['relevance'][i]
+            if 'dsa' in results:
+                row['dsa_similarity'] = results['dsa'][i]['relevance_score']
+                best_match = results['dsa'][i]['best_match']
+                row['dsa_best_match'] = best_match['title'] if best_match else None
+            if 'bias' in results:
+                row['bias_valid'] = results['bias'][i]['valid']
+                row['biased_terms'] = results['bias'][i]['biased_terms']
+            rows.append(row)
+        return rows
+
+    def _summarize(self, results):
+        summary = {}
+        if results.get('relevance'):
+            summary['relevance'] = sum(results['relevance']) / len(results['relevance'])
+        if results.get('dsa'):
+            summary['dsa_similarity'] = sum(r['relevance_score'] for r in results['dsa']) / len(results['dsa'])
+        if results.get('bias'):
+            summary['bias_accuracy'] = sum(1 for r in results['bias'] if r['valid']) / len(results['bias'])
+        return summary
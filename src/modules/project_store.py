@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+PROJECTS_DIR = "projects"
+DEFAULT_STORE_PATH = os.getenv("PROJECT_STORE_PATH", os.path.join(PROJECTS_DIR, "projects.sqlite"))
+
+# Project fields kept as append-only history records, and their record kind
+HISTORY_FIELDS = {'accuracy_history': 'accuracy', 'log_history': 'log'}
+# Key in a loaded project remembering how many history entries are already stored
+STORED_COUNTS_KEY = '_stored_history'
+
+
+def _entry_timestamp(entry):
+    # History entries are [timestamp, value, ...] pairs or dicts with a timestamp
+    if isinstance(entry, (list, tuple)) and entry and isinstance(entry[0], str):
+        return entry[0]
+    if isinstance(entry, dict) and 'timestamp' in entry:
+        return str(entry['timestamp'])
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class ProjectStore:
+    """
+    SQLite-backed project storage.
+
+    Assertions and other settings are a small JSON config per project that is
+    replaced on save. History (accuracy and log entries) is stored as
+    append-only rows indexed by project, kind, question type and timestamp, so
+    a save only writes the entries added since the project was loaded and costs
+    the same however long the history grows. Concurrent writers each append
+    their own new entries; the config is last-writer-wins.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            "name TEXT PRIMARY KEY, config TEXT NOT NULL, layout TEXT NOT NULL, created REAL NOT NULL, "
+            "updated REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, project TEXT NOT NULL, kind TEXT NOT NULL, "
+            "question_type TEXT, timestamp TEXT NOT NULL, entry TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS history_lookup ON history (project, kind, question_type, timestamp)"
+        )
+        self._db.commit()
+
+    def list_projects(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT name FROM projects ORDER BY name")]
+
+    def exists(self, name):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone() is not None
+
+    def load(self, name):
+        """Return the project as the familiar dict (config plus full history), or None."""
+        with self._lock:
+            row = self._db.execute("SELECT config, layout FROM projects WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            rows = self._db.execute(
+                "SELECT kind, question_type, entry FROM history WHERE project = ? ORDER BY id", (name,)
+            ).fetchall()
+        data = json.loads(row[0])
+        layout = json.loads(row[1])
+        counts = {}
+        for field, kind in HISTORY_FIELDS.items():
+            if field not in layout:
+                continue
+            # A list of keys means history grouped by question type, None a flat list
+            data[field] = {key: [] for key in layout[field]} if layout[field] is not None else []
+            counts[field] = {key: 0 for key in layout[field]} if layout[field] is not None else 0
+        fields = {kind: field for field, kind in HISTORY_FIELDS.items()}
+        for kind, question_type, entry in rows:
+            field = fields[kind]
+            if field not in data:
+                continue
+            if isinstance(data[field], dict):
+                data[field].setdefault(question_type, []).append(json.loads(entry))
+                counts[field][question_type] = counts[field].get(question_type, 0) + 1
+            else:
+                data[field].append(json.loads(entry))
+                counts[field] += 1
+        data[STORED_COUNTS_KEY] = counts
+        return data
+
+    def save(self, name, data):
+        """
+        Store a project dict.
+
+        The config is replaced; only history entries beyond those already
+        stored when `data` was loaded are appended. `data` is updated to
+        remember what is now stored, so saving it again appends nothing twice.
+        """
+        stored = data.get(STORED_COUNTS_KEY) or {}
+        config = {key: value for key, value in data.items() if key not in HISTORY_FIELDS and key != STORED_COUNTS_KEY}
+        layout = {}
+        rows = []
+        counts = {}
+        for field, kind in HISTORY_FIELDS.items():
+            history = data.get(field)
+            if history is None:
+                continue
+            stored_count = stored.get(field)
+            if isinstance(history, dict):
+                layout[field] = list(history)
+                counts[field] = {}
+                stored_count = stored_count if isinstance(stored_count, dict) else {}
+                for question_type, entries in history.items():
+                    start = stored_count.get(question_type, 0)
+                    rows += [(name, kind, question_type, _entry_timestamp(entry), json.dumps(entry))
+                             for entry in entries[start:]]
+                    counts[field][question_type] = len(entries)
+            else:
+                layout[field] = None
+                start = stored_count if isinstance(stored_count, int) else 0
+                rows += [(name, kind, None, _entry_timestamp(entry), json.dumps(entry)) for entry in history[start:]]
+                counts[field] = len(history)
+
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO projects (name, config, layout, created, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET config = excluded.config, layout = excluded.layout, "
+                "updated = excluded.updated",
+                (name, json.dumps(config), json.dumps(layout), now, now)
+            )
+            self._db.executemany(
+                "INSERT INTO history (project, kind, question_type, timestamp, entry) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        data[STORED_COUNTS_KEY] = counts
+        return len(rows)
+
+    def history(self, name, field='accuracy_history', question_type=None, start=None, end=None, limit=None):
+        """
+        Range query over one history field, oldest first.
+
+        Args:
+            question_type (str): Only entries recorded under this question type
+            start, end (str): Inclusive timestamp bounds ("YYYY-MM-DD HH:MM:SS" sorts as text)
+            limit (int): Maximum number of entries
+        """
+        query = "SELECT entry FROM history WHERE project = ? AND kind = ?"
+        params = [name, HISTORY_FIELDS[field]]
+        if question_type is not None:
+            query += " AND question_type = ?"
+            params.append(question_type)
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND timestamp <= ?"
+            params.append(end)
+        query += " ORDER BY timestamp, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(query, params)]
+
+    def migrate_json(self, directory=PROJECTS_DIR):
+        """Import projects/*.json files that are not in the store yet; the files are left in place."""
+        if not os.path.isdir(directory):
+            return []
+        migrated = []
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.endswith(".json"):
+                continue
+            name = file_name[:-len(".json")]
+            if self.exists(name):
+                continue
+            with open(os.path.join(directory, file_name), "r") as f:
+                data = json.load(f)
+            self.save(name, data)
+            migrated.append(name)
+        if migrated:
+            print(f"Migrated {len(migrated)} JSON projects into {self.path}: {', '.join(migrated)}")
+        return migrated
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_project_store():
+    """Process-wide store at DEFAULT_STORE_PATH; JSON projects are migrated on first use."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = ProjectStore()
+            _shared_store.migrate_json(PROJECTS_DIR)
+        return _shared_store
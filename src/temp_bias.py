@@ -1,6 +1,8 @@
 import spacy
 from textblob import TextBlob
 
+from src.modules.module4_bias.semantic import SemanticBiasDetector
+
 nlp = spacy.load('en_core_web_md')  
 
 # Define biased terms
@@ -13,24 +15,20 @@ biased_terms = [
     "married", "single", "divorced", "widowed", "children", "family", "dumb", "intelligent", "beautiful", "ugly"
 ]
 
-# Preprocess biased terms as spaCy docs
-biased_docs = [nlp(term) for term in biased_terms]
+# Normalized bias-term vectors, computed once
+bias_detector = SemanticBiasDetector(biased_terms, nlp)
+
+def _bias_result(hit):
+    if hit['biased']:
+        print(f"⚠️ Biased term detected: '{hit['token']}' similar to '{hit['term']}' ({hit['max_similarity']:.2f})")
+        return False, hit['max_similarity']  # Mark as biased
+    return True, hit['max_similarity']  # Unbiased with similarity score
 
 def screen_for_bias(question, threshold=0.85):
     """
     Checks if a question contains biased terms directly or has high similarity.
     """
-    doc = nlp(question)
-    max_similarity = 0
-    for token in doc:
-        for biased_doc in biased_docs:
-            similarity = token.similarity(biased_doc)
-            if similarity > max_similarity:
-                max_similarity = similarity
-            if similarity >= threshold:
-                print(f"⚠️ Biased term detected: '{token.text}' similmmar to '{biased_doc.text}' ({similarity:.2f})")
-                return False, max_similarity  # Mark as biased
-    return True, max_similarity  # Unbiased with similarity score
+    return _bias_result(bias_detector.scan([question], threshold=threshold)[0])
 
 def screen_for_offensive_language(question):
     """
@@ -62,8 +60,10 @@ def screen_questions(questions):
     invalid_questions = []
     combined_scores = []
 
-    for question in questions:
-        is_unbiased, score1 = screen_for_bias(question)
+    # Every question's tokens are scored against all terms in one batch
+    bias_hits = bias_detector.scan(questions, threshold=0.85)
+    for question, hit in zip(questions, bias_hits):
+        is_unbiased, score1 = _bias_result(hit)
         is_non_offensive, score2 = screen_for_offensive_language(question)
 
         combined_score = combine_scores(score1, score2)
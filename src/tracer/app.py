@@ -1,9 +1,16 @@
 import streamlit as st
-import json
 import os
+import sys
 from datetime import datetime
 import pandas as pd
 
+# Make the project modules importable (shared project store)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.append(project_root)
+
+from src.modules.project_store import get_project_store
+
 PROJECTS_DIR = "projects"
 DATASET_DIR = "dataset"
 
@@ -13,19 +20,14 @@ if not os.path.exists(PROJECTS_DIR):
 
 # Helper Functions
 def list_projects():
-    return [f.replace(".json", "") for f in os.listdir(PROJECTS_DIR) if f.endswith(".json")]
+    return get_project_store().list_projects()
 
 def load_project(project_name):
-    file_path = os.path.join(PROJECTS_DIR, f"{project_name}.json")
-    if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            return json.load(f)
-    return None
+    return get_project_store().load(project_name)
 
 def save_project(project_name, data):
-    file_path = os.path.join(PROJECTS_DIR, f"{project_name}.json")
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=4)
+    # Appends new history entries instead of rewriting the whole project
+    get_project_store().save(project_name, data)
 
 def initialize_project(project_name):
     data = {
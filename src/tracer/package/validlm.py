@@ -1,13 +1,26 @@
 import json
 import os
+import sys
 import logging
 import re
 import subprocess
 from functools import wraps
 
+# Make the project modules importable (shared LLM cache, transport and project store)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.append(project_root)
+
 from tools.tools import verify_sql_query
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
+from src.modules.module1_question_generation.llm_cache import get_llm_cache
+from src.modules.module1_question_generation.llm_transport import get_transport
+from src.modules.project_store import get_project_store
+
+# Model used for clarifying questions
+CLARIFYING_MODEL = "mixtral-8x7b-32768"
+# Groq JSON mode
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -15,18 +28,16 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 class ValidLM:
     """Validation & Logging System for LLM Applications"""
 
-    PROJECTS_DIR = "projects"  # Define the directory for project files
-
     def __init__(self, project_name="default_project"):
         self.project_name = project_name
-        self.project_file = os.path.join(self.PROJECTS_DIR, f"{project_name}.json")
+        self.store = get_project_store()
         self.knowledge_base = None  # Could be a link, PDF, or CSV
         self._initialize_project()
         # self._start_streamlit_ui
 
     def _initialize_project(self):
-        """Create an empty project file if it doesn't exist"""
-        if not os.path.exists(self.project_file):
+        """Create an empty project if it doesn't exist"""
+        if not self.store.exists(self.project_name):
             initial_data = {
                 "project_name": self.project_name,
                 "assertions": {
@@ -39,18 +50,15 @@ class ValidLM:
                 "log_history": [],
                 "accuracy_history": []
             }
-            with open(self.project_file, "w") as f:
-                json.dump(initial_data, f, indent=4)
+            self._save_project(initial_data)
 
     def _load_project(self):
-        """Load the project data from the JSON file"""
-        with open(self.project_file, "r") as f:
-            return json.load(f)
+        """Load the project data from the project store"""
+        return self.store.load(self.project_name)
 
     def _save_project(self, data):
-        """Save the project data to the JSON file"""
-        with open(self.project_file, "w") as f:
-            json.dump(data, f, indent=4)
+        """Save the project config and append its new history entries"""
+        self.store.save(self.project_name, data)
 
     def _start_streamlit_ui(self):
         """Start Streamlit UI in the background"""
@@ -82,10 +90,11 @@ class ValidLM:
         self._save_project(project_data)
         logging.info(f"Added {assertion_type} assertion: {assertion}")
 
-    def generate_clarifying_questions(self, user_input):
-        """Generate clarifying questions using ChatGroq in JSON mode."""
-        llm = ChatGroq(temperature=0, response_format="json")
-
+    def generate_clarifying_questions(self, user_input, use_cache=True):
+        """
+        Generate clarifying questions in JSON mode through the shared LLM transport.
+        Responses for identical inputs come from the shared LLM cache unless use_cache is False.
+        """
         prompt = ChatPromptTemplate.from_template("""
         Given the user prompt: "{user_input}", generate clarifying multiple-choice questions
         to define constraints, preferences, and requirements.
@@ -105,7 +114,19 @@ class ValidLM:
         Return ONLY valid JSON as per the format above.
         """)
 
-        response = llm.predict(prompt.format(user_input=user_input))
+        prompt_text = prompt.format(user_input=user_input)
+        params = {
+            "model": CLARIFYING_MODEL,
+            "messages": [{"role": "user", "content": prompt_text}],
+            "temperature": 0,
+            "response_format": JSON_RESPONSE_FORMAT
+        }
+        cache = get_llm_cache()
+        key = cache.fingerprint(**params)
+        response = cache.get(key) if use_cache else None
+        if response is None:
+            response = get_transport().complete(**params)
+            cache.put(key, response)
 
         try:
             clarifying_questions = json.loads(response)